@@ -19,39 +19,167 @@ function takeLastTexts(nodes, limit) {
   return out.join('\n\n').trim()
 }
 
-function siteSpecific() {
+// Chat turn selectors per supported site
+const SITE_SELECTORS = [
+  { hosts: ['chat.openai.com'], selector: '[data-testid="conversation-turn"], div[data-message-author-role], .markdown' },
+  { hosts: ['claude.ai'], selector: '[data-testid*="message"], div[class*="Message"], article' },
+  { hosts: ['poe.com'], selector: '[data-testid*="message"], div[class*="Messages"], article' },
+  { hosts: ['perplexity.ai'], selector: 'article, div[class*="prose"], div[class*="answer"]' },
+  { hosts: ['gemini.google.com'], selector: 'div[class*="response"], article, div[role="article"]' },
+  { hosts: ['bing.com', 'copilot.microsoft.com'], selector: 'cib-message, div[class*="cib"] article, div[class*="message"]' },
+]
+
+const MAX_TURNS = 20        // turns joined into the detected text
+const MAX_INDEXED = 500     // oldest turns beyond this are dropped from the index
+const FRAME_BUDGET_MS = 8   // indexing work allowed per animation frame
+
+function siteSelector() {
   const host = location.hostname || ''
-  if (host.includes('chat.openai.com')) {
-    const turns = document.querySelectorAll('[data-testid="conversation-turn"], div[data-message-author-role], .markdown')
-    const t = takeLastTexts(turns, 20)
-    if (t && t.length > 80) return t
+  const site = SITE_SELECTORS.find(s => s.hosts.some(h => host.includes(h)))
+  return site ? site.selector : ''
+}
+
+// Incremental index of chat turns, maintained by a MutationObserver.
+// Mutations only queue elements; reading innerText (which forces layout)
+// happens in animation frames with a per-frame time budget, so answering
+// GET_CHAT_TEXT never touches the DOM.
+const turnIndex = {
+  selector: siteSelector(),
+  turns: [],              // { id, el, text, seq } in document order
+  byEl: new Map(),        // element -> turn
+  pending: new Set(),     // elements to (re)index
+  seq: 0,                 // bumped whenever a turn is added or changes
+  nextId: 1,
+  epoch: Date.now(),      // changes when the index is rebuilt from scratch
+  scheduled: false,
+  needsSort: false,
+}
+
+function turnsContaining(el) {
+  // Selectors overlap (a turn and its markdown body), so every matching
+  // ancestor is a turn; duplicates are dropped by text when reading
+  const turns = []
+  let turn = el.closest(turnIndex.selector)
+  while (turn) {
+    turns.push(turn)
+    turn = turn.parentElement ? turn.parentElement.closest(turnIndex.selector) : null
   }
-  if (host.includes('claude.ai')) {
-    const msgs = document.querySelectorAll('[data-testid*="message"], div[class*="Message"], article')
-    const t = takeLastTexts(msgs, 20)
-    if (t && t.length > 80) return t
+  return turns
+}
+
+function queueNode(node, sweep) {
+  const el = node.nodeType === Node.ELEMENT_NODE ? node : node.parentElement
+  if (!el) return
+  const turns = turnsContaining(el)
+  turns.forEach(t => turnIndex.pending.add(t))
+  if (sweep && el.querySelectorAll) {
+    // Only freshly added subtrees are searched, never the whole document
+    el.querySelectorAll(turnIndex.selector).forEach(t => turnIndex.pending.add(t))
   }
-  if (host.includes('poe.com')) {
-    const msgs = document.querySelectorAll('[data-testid*="message"], div[class*="Messages"], article')
-    const t = takeLastTexts(msgs, 20)
-    if (t && t.length > 80) return t
+  if (turnIndex.pending.size) scheduleFlush()
+}
+
+function scheduleFlush() {
+  if (turnIndex.scheduled) return
+  turnIndex.scheduled = true
+  requestAnimationFrame(flushPending)
+}
+
+function flushPending() {
+  turnIndex.scheduled = false
+  const start = performance.now()
+  for (const el of turnIndex.pending) {
+    if (performance.now() - start > FRAME_BUDGET_MS) break
+    turnIndex.pending.delete(el)
+    indexTurn(el)
   }
-  if (host.includes('perplexity.ai')) {
-    const prose = document.querySelectorAll('article, div[class*="prose"], div[class*="answer"]')
-    const t = takeLastTexts(prose, 20)
-    if (t && t.length > 80) return t
+  if (turnIndex.needsSort) {
+    // Forget detached turns entirely, so their subtrees can be collected and
+    // a re-attached element is indexed again as a new turn
+    turnIndex.turns = turnIndex.turns.filter(t => {
+      if (t.el.isConnected) return true
+      turnIndex.byEl.delete(t.el)
+      return false
+    })
+    turnIndex.turns.sort((a, b) => (a.el.compareDocumentPosition(b.el) & Node.DOCUMENT_POSITION_FOLLOWING) ? -1 : 1)
+    if (turnIndex.turns.length > MAX_INDEXED) {
+      turnIndex.turns.splice(0, turnIndex.turns.length - MAX_INDEXED).forEach(t => turnIndex.byEl.delete(t.el))
+    }
+    turnIndex.needsSort = false
   }
-  if (host.includes('gemini.google.com')) {
-    const resp = document.querySelectorAll('div[class*="response"], article, div[role="article"]')
-    const t = takeLastTexts(resp, 20)
-    if (t && t.length > 80) return t
+  if (turnIndex.pending.size) scheduleFlush()
+}
+
+function indexTurn(el) {
+  if (!el.isConnected) return
+  const text = textFrom(el)
+  let turn = turnIndex.byEl.get(el)
+  if (turn) {
+    if (turn.text === text) return
+    turn.text = text
+    turn.seq = ++turnIndex.seq
+    return
   }
-  if (host.includes('bing.com') || host.includes('copilot.microsoft.com')) {
-    const msgs = document.querySelectorAll('cib-message, div[class*="cib"] article, div[class*="message"]')
-    const t = takeLastTexts(msgs, 20)
-    if (t && t.length > 80) return t
+  turn = { id: turnIndex.nextId++, el, text, seq: ++turnIndex.seq }
+  turnIndex.byEl.set(el, turn)
+  const last = turnIndex.turns[turnIndex.turns.length - 1]
+  if (last && !(last.el.compareDocumentPosition(el) & Node.DOCUMENT_POSITION_FOLLOWING)) {
+    turnIndex.needsSort = true
+  }
+  turnIndex.turns.push(turn)
+  if (turnIndex.turns.length > MAX_INDEXED) turnIndex.needsSort = true
+}
+
+function startTurnIndex() {
+  if (!turnIndex.selector || !document.body) return
+  document.querySelectorAll(turnIndex.selector).forEach(el => turnIndex.pending.add(el))
+  scheduleFlush()
+  new MutationObserver((mutations) => {
+    for (const m of mutations) {
+      queueNode(m.target, false)
+      if (m.type === 'childList') {
+        m.addedNodes.forEach(n => queueNode(n, true))
+        // Removed turns are pruned on the next flush
+        if (m.removedNodes.length) turnIndex.needsSort = true
+      }
+    }
+  }).observe(document.body, { childList: true, subtree: true, characterData: true })
+}
+
+function recentTurns() {
+  const out = []
+  const seen = new Set()
+  for (let i = turnIndex.turns.length - 1; i >= 0 && out.length < MAX_TURNS; i--) {
+    const t = turnIndex.turns[i]
+    if (t.text && t.el.isConnected && !seen.has(t.text)) {
+      out.push(t)
+      seen.add(t.text)
+    }
+  }
+  return out.reverse()
+}
+
+function siteSpecific(since) {
+  if (!turnIndex.selector) return null
+  // Popup opened before the first frame was indexed: drain the queue once
+  if (!turnIndex.turns.length && turnIndex.pending.size) {
+    turnIndex.pending.forEach(indexTurn)
+    turnIndex.pending.clear()
+  }
+  const turns = recentTurns()
+  const text = turns.map(t => t.text).join('\n\n').trim()
+  if (!text || text.length <= 80) return null
+  // Only turns added or changed after the caller's cursor are sent back;
+  // the caller merges them by id and orders them by position in `order`
+  const fresh = since && since.epoch === turnIndex.epoch
+  return {
+    text: fresh ? '' : text,
+    turns: turns.filter(t => !fresh || t.seq > since.cursor).map(t => ({ id: t.id, text: t.text })),
+    order: turns.map(t => t.id),
+    cursor: turnIndex.seq,
+    epoch: turnIndex.epoch,
+    delta: !!fresh,
   }
-  return ''
 }
 
 function genericDetect() {
@@ -80,17 +208,19 @@ function genericDetect() {
   return (document.body && document.body.innerText) ? document.body.innerText.trim() : ''
 }
 
-function detectChatText() {
-  const s = siteSpecific()
-  if (s && s.length > 80) return s
-  return genericDetect()
+function detectChatText(since) {
+  const s = siteSpecific(since)
+  if (s) return s
+  return { text: genericDetect(), delta: false }
 }
 
+startTurnIndex()
+
 chrome.runtime.onMessage.addListener((msg, _sender, sendResponse) => {
   if (msg && msg.type === 'GET_CHAT_TEXT') {
     try {
-      const t = detectChatText()
-      sendResponse({ ok: true, text: t })
+      const result = detectChatText(msg.since)
+      sendResponse({ ok: true, ...result })
     } catch (e) {
       sendResponse({ ok: false, error: 'failed_to_detect' })
     }
@@ -1,4 +1,6 @@
 const DEFAULT_API_BASE = 'https://carryon-summarizer.vercel.app'
+// Popup UX budget: the server returns its best summary within this window
+const DEADLINE_MS = 1000
 
 async function getConfig() {
   return new Promise((resolve) => {
@@ -21,6 +23,7 @@ async function summarize(text, target) {
   const base = cfg.API_BASE_URL || DEFAULT_API_BASE
   const url = base ? `${base}/api/summarize` : '/api/summarize'
   const body = target ? { text, target_sentences: target } : { text }
+  body.deadline_ms = DEADLINE_MS
   const res = await fetch(url, {
     method: 'POST',
     headers: { 'Content-Type': 'application/json' },
@@ -31,6 +34,32 @@ async function summarize(text, target) {
   return data.summary || ''
 }
 
+// The content script only sends chat turns added or changed since the last
+// request; the turns seen so far are kept per tab in session storage
+async function getChatText(tabId) {
+  const key = `chat:${tabId}`
+  const stored = (await chrome.storage.session.get(key))[key]
+  const since = stored ? { epoch: stored.epoch, cursor: stored.cursor } : null
+  let resp = await chrome.tabs.sendMessage(tabId, { type: 'GET_CHAT_TEXT', since })
+  if (!resp || !resp.ok) return ''
+  if (!resp.order) return resp.text || ''
+
+  const turns = resp.delta && stored ? stored.turns : {}
+  resp.turns.forEach(t => { turns[t.id] = t.text })
+  if (resp.order.some(id => !(id in turns))) {
+    // Cached turns were lost; ask for everything again
+    resp = await chrome.tabs.sendMessage(tabId, { type: 'GET_CHAT_TEXT' })
+    if (!resp || !resp.ok) return ''
+    if (!resp.order) return resp.text || ''
+    Object.keys(turns).forEach(id => delete turns[id])
+    resp.turns.forEach(t => { turns[t.id] = t.text })
+  }
+  const kept = {}
+  resp.order.forEach(id => { kept[id] = turns[id] })
+  await chrome.storage.session.set({ [key]: { epoch: resp.epoch, cursor: resp.cursor, turns: kept } })
+  return resp.order.map(id => kept[id]).join('\n\n').trim()
+}
+
 document.getElementById('grab').addEventListener('click', async () => {
   const [tab] = await chrome.tabs.query({ active: true, currentWindow: true })
   const [{result}] = await chrome.scripting.executeScript({
@@ -93,14 +122,14 @@ window.addEventListener('DOMContentLoaded', async () => {
 
   try {
     const [tab] = await chrome.tabs.query({ active: true, currentWindow: true })
-    const resp = await chrome.tabs.sendMessage(tab.id, { type: 'GET_CHAT_TEXT' })
-    if (resp && resp.ok && resp.text && resp.text.length > 80) {
-      document.getElementById('input').value = resp.text
+    const detected = await getChatText(tab.id)
+    if (detected && detected.length > 80) {
+      document.getElementById('input').value = detected
       // auto-run summarize
       const auto = document.getElementById('auto').checked
       const target = parseInt(document.getElementById('target').value, 10)
       setStatus('Auto-detected chat text')
-      const text = await summarize(resp.text, auto ? undefined : target)
+      const text = await summarize(detected, auto ? undefined : target)
       document.getElementById('summary').textContent = text
       setStatus('Done')
     }
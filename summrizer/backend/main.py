@@ -10,6 +10,8 @@ import os
 # Import route blueprints
 from backend.routes.api_routes import api_bp
 from backend.routes.web_routes import web_bp
+from backend.routes.debug_routes import debug_bp
+from backend.services.engine_registry import engine_registry
 
 
 def create_app(config=None):
@@ -46,6 +48,10 @@ def create_app(config=None):
     # Register blueprints
     app.register_blueprint(api_bp)
     app.register_blueprint(web_bp)
+    app.register_blueprint(debug_bp)
+    
+    # Warm up summarization engines before the first request
+    engine_registry.warm_up()
     
     # Static file serving routes for Vercel
     @app.route('/static/<path:filename>')
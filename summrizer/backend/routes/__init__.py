@@ -3,5 +3,6 @@ Route blueprints for CarryOn Summary
 """
 from .api_routes import api_bp
 from .web_routes import web_bp
+from .debug_routes import debug_bp
 
-__all__ = ['api_bp', 'web_bp']
\ No newline at end of file
+__all__ = ['api_bp', 'web_bp', 'debug_bp']
\ No newline at end of file
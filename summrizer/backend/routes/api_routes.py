@@ -3,7 +3,15 @@ API Routes for CarryOn Summary
 Handles all API endpoints and business logic
 """
 from flask import Blueprint, request, jsonify
-from backend.services.summarizer_service import summarizer_service
+from backend.services.engine_registry import engine_registry, UnknownEngine, UnsupportedOption
+from backend.services.profiler_service import profiler_service
+from backend.services.metrics_service import metrics_service
+from backend.services.job_service import job_service, JobStoreFull
+from backend.services.differential import shadow_runner
+from backend.services.coalescing_service import summarize_flight, request_key, CoalesceTimeout
+from backend.services.cancellation import (
+    Cancelled, CancellationToken, disconnect_watcher, REQUEST_TIMEOUT_MS
+)
 
 # Create API blueprint
 api_bp = Blueprint('api', __name__, url_prefix='/api')
@@ -17,7 +25,10 @@ def summarize():
     Request body:
     {
         "text": "Text to summarize",
-        "target_sentences": 16  // optional, null for auto-size
+        "target_sentences": 16,  // optional, null for auto-size
+        "deadline_ms": 1000,     // optional latency budget
+        "focus": ["auth migration"],  // optional focus phrases
+        "engine": "extractive"   // optional engine name, or "auto"
     }
     
     Response:
@@ -26,40 +37,29 @@ def summarize():
         "meta": {
             "words_total": 1234,
             "chunks": 2,
-            "target_sentences": 16
+            "target_sentences": 16,
+            "engine": "extractive"
         }
     }
     """
     try:
-        data = request.get_json()
-        
-        # Validate request
-        if not data or 'text' not in data:
-            return jsonify({
-                'error': 'Text is required',
-                'code': 'MISSING_TEXT'
-            }), 400
+        params, error = _parse_summarize_request(request.get_json())
+        if error:
+            return error
         
-        text = data['text']
-        target_sentences = data.get('target_sentences')
-        
-        # Validate text content
-        if not text or not text.strip():
-            return jsonify({
-                'error': 'Text cannot be empty',
-                'code': 'EMPTY_TEXT'
-            }), 400
-        
-        # Validate target_sentences parameter
-        if target_sentences is not None:
-            if not isinstance(target_sentences, int) or target_sentences < 4 or target_sentences > 80:
-                return jsonify({
-                    'error': 'Target sentences must be an integer between 4 and 80',
-                    'code': 'INVALID_TARGET_SENTENCES'
-                }), 400
-        
-        # Perform summarization
-        summary, meta = summarizer_service.summarize_text(text, target_sentences)
+        # Identical concurrent requests share a single computation, which
+        # stops early once every client waiting on it has disconnected or
+        # hit the request timeout
+        key = request_key(params['text'], target_sentences=params['target_sentences'],
+                          deadline_ms=params['deadline_ms'], focus=params['focus'],
+                          engine=params['engine'])
+        token = CancellationToken(deadline_ms=REQUEST_TIMEOUT_MS)
+        with disconnect_watcher.watch(request.environ, token):
+            (summary, meta), shared = summarize_flight.do(
+                key, lambda cancel: _run_summarization(params, cancel), cancel=token
+            )
+        if shared:
+            meta = {**meta, 'coalesced': True}
         
         return jsonify({
             'summary': summary,
@@ -67,6 +67,24 @@ def summarize():
             'status': 'success'
         })
     
+    except CoalesceTimeout as e:
+        return jsonify({
+            'error': str(e),
+            'code': 'COALESCE_TIMEOUT'
+        }), 504
+    except Cancelled as e:
+        # A shared computation reports why it stopped for everyone; this
+        # caller's own token says why it stopped for this client
+        if token.reason == CancellationToken.DEADLINE:
+            return jsonify({
+                'error': f'Summarization exceeded the {REQUEST_TIMEOUT_MS}ms request timeout',
+                'code': 'REQUEST_TIMEOUT'
+            }), 504
+        # The client is gone; nginx's "client closed request" status is only for the logs
+        return jsonify({
+            'error': str(e),
+            'code': 'CANCELLED'
+        }), 499
     except Exception as e:
         return jsonify({
             'error': f'Internal server error: {str(e)}',
@@ -74,6 +92,199 @@ def summarize():
         }), 500
 
 
+def _parse_summarize_request(data):
+    """
+    Validate a summarization request body
+    
+    Returns:
+        Tuple of (params, error_response); exactly one is None
+    """
+    if not data or 'text' not in data:
+        return None, (jsonify({
+            'error': 'Text is required',
+            'code': 'MISSING_TEXT'
+        }), 400)
+    
+    text = data['text']
+    target_sentences = data.get('target_sentences')
+    deadline_ms = data.get('deadline_ms')
+    focus = data.get('focus')
+    engine_name = data.get('engine')
+    
+    # Validate text content
+    if not text or not text.strip():
+        return None, (jsonify({
+            'error': 'Text cannot be empty',
+            'code': 'EMPTY_TEXT'
+        }), 400)
+    
+    # Validate target_sentences parameter
+    if target_sentences is not None:
+        if not isinstance(target_sentences, int) or target_sentences < 4 or target_sentences > 80:
+            return None, (jsonify({
+                'error': 'Target sentences must be an integer between 4 and 80',
+                'code': 'INVALID_TARGET_SENTENCES'
+            }), 400)
+    
+    # Validate deadline_ms parameter
+    if deadline_ms is not None:
+        if isinstance(deadline_ms, bool) or not isinstance(deadline_ms, int) or deadline_ms < 1 or deadline_ms > 60000:
+            return None, (jsonify({
+                'error': 'Deadline must be an integer between 1 and 60000 milliseconds',
+                'code': 'INVALID_DEADLINE'
+            }), 400)
+    
+    # Validate focus parameter: a phrase or a list of phrases
+    if focus is not None:
+        if isinstance(focus, str):
+            focus = [focus]
+        if (not isinstance(focus, list) or len(focus) > 20
+                or not all(isinstance(f, str) and len(f) <= 200 for f in focus)):
+            return None, (jsonify({
+                'error': 'Focus must be a string or a list of up to 20 strings of at most 200 characters',
+                'code': 'INVALID_FOCUS'
+            }), 400)
+    
+    # Resolve the engine: by name, by the configured default, or routed by cost
+    if engine_name is not None and not isinstance(engine_name, str):
+        return None, (jsonify({
+            'error': 'Engine must be a string',
+            'code': 'INVALID_ENGINE'
+        }), 400)
+    options = [name for name, value in (('deadline_ms', deadline_ms), ('focus', focus)) if value]
+    try:
+        engine = engine_registry.select(text, engine_name, options, deadline_ms)
+    except UnknownEngine as e:
+        return None, (jsonify({
+            'error': str(e),
+            'code': 'INVALID_ENGINE'
+        }), 400)
+    except UnsupportedOption as e:
+        return None, (jsonify({
+            'error': str(e),
+            'code': 'UNSUPPORTED_OPTION'
+        }), 400)
+    
+    # Reject inputs predicted to exceed the per-request memory cap
+    if metrics_service.max_request_bytes:
+        shape = metrics_service.text_shape(text)
+        predicted = metrics_service.predict(shape['words_total'], shape['sentences_total'])
+        if metrics_service.exceeds_cap(predicted, text):
+            return None, (jsonify({
+                'error': 'Input is predicted to exceed the memory limit for a single request',
+                'code': 'INPUT_TOO_LARGE',
+                'predicted': predicted
+            }), 413)
+    
+    return {
+        'text': text,
+        'target_sentences': target_sentences,
+        'deadline_ms': deadline_ms,
+        'focus': focus,
+        'engine': engine.name
+    }, None
+
+
+def _run_summarization(params, cancel=None):
+    """Summarize validated params with the chosen engine, profiling and recording cost"""
+    engine = engine_registry.get(params['engine'])
+    with profiler_service.profile('summarize') as profile_meta:
+        summary, meta = engine.summarize(
+            params['text'], params['target_sentences'], params['deadline_ms'], params['focus'],
+            cancel
+        )
+        meta['engine'] = engine.name
+        profile_meta.update(meta)
+    metrics_service.observe(meta)
+    
+    # Deadlines, focus, approximate term weights and corpus IDF change
+    # selection on purpose, so only plain exactly-scored requests are shadowed
+    if (engine.shadow and params['deadline_ms'] is None and not params['focus']
+            and 'approximate' not in meta and 'idf' not in meta):
+        shadow_runner.maybe_shadow(params['text'], params['target_sentences'], (summary, meta))
+    return summary, meta
+
+
+@api_bp.route('/jobs', methods=['POST'])
+def create_job():
+    """
+    Queue a summarization job and return immediately
+    
+    Request body: same as POST /api/summarize
+    
+    Response (202):
+    {
+        "job_id": "3f2a...",
+        "status": "queued",
+        "status_url": "/api/jobs/3f2a..."
+    }
+    """
+    try:
+        params, error = _parse_summarize_request(request.get_json())
+        if error:
+            return error
+        
+        job = job_service.submit(params, _run_job)
+        
+        return jsonify({
+            'job_id': job.id,
+            'status': job.status,
+            'status_url': f"{api_bp.url_prefix}/jobs/{job.id}"
+        }), 202
+    
+    except JobStoreFull as e:
+        return jsonify({
+            'error': f'Job queue is full: {str(e)}',
+            'code': 'QUEUE_FULL'
+        }), 503
+    except Exception as e:
+        return jsonify({
+            'error': f'Internal server error: {str(e)}',
+            'code': 'INTERNAL_ERROR'
+        }), 500
+
+
+@api_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """
+    Job status and result
+    
+    Query parameters:
+        wait: Seconds to long-poll for completion (0-30)
+    """
+    job = job_service.get(job_id)
+    if job is None:
+        return jsonify({
+            'error': 'Job not found',
+            'code': 'JOB_NOT_FOUND'
+        }), 404
+    
+    wait = request.args.get('wait', type=float) or 0.0
+    if wait > 0 and not job.is_finished:
+        job_service.wait(job, min(wait, 30.0))
+    
+    return jsonify(job.to_dict())
+
+
+@api_bp.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """Cancel a queued or running job"""
+    job = job_service.cancel(job_id)
+    if job is None:
+        return jsonify({
+            'error': 'Job not found',
+            'code': 'JOB_NOT_FOUND'
+        }), 404
+    
+    return jsonify(job.to_dict())
+
+
+def _run_job(params, cancel):
+    """Job worker body: summarize and package the result like /api/summarize"""
+    summary, meta = _run_summarization(params, cancel)
+    return {'summary': summary, 'meta': meta}
+
+
 @api_bp.route('/health', methods=['GET'])
 def health():
     """Health check endpoint"""
@@ -94,14 +305,34 @@ def info():
         'endpoints': {
             'POST /api/summarize': 'Summarize text content',
             'GET /api/health': 'Health check',
-            'GET /api/info': 'API information'
+            'GET /api/info': 'API information',
+            'POST /api/jobs': 'Queue a summarization job',
+            'GET /api/jobs/<id>': 'Job status and result (supports ?wait=seconds)',
+            'DELETE /api/jobs/<id>': 'Cancel a job',
+            'POST /api/stats': 'Text statistics and predicted cost',
+            'GET /api/metrics': 'Request cost metrics and cost model'
         },
         'features': [
             'Auto-size summaries based on content length',
             'Manual target sentence control (4-80)',
             'Hierarchical processing for long texts',
+            'Optional latency budget with graceful degradation',
+            'Query-focused summaries via focus terms',
+            'Selectable summarization engines with cost-based routing',
             'Preserves key information and structure'
-        ]
+        ],
+        'engines': engine_registry.list(),
+        'default_engine': engine_registry.default
+    })
+
+
+@api_bp.route('/metrics', methods=['GET'])
+def metrics():
+    """Request cost metrics and the fitted cost model"""
+    return jsonify({
+        **metrics_service.snapshot(),
+        'coalescing': summarize_flight.snapshot(),
+        'status': 'success'
     })
 
 
@@ -120,7 +351,8 @@ def stats():
         "words_total": 1234,
         "sentences_total": 45,
         "paragraphs_total": 8,
-        "recommended_target": 16
+        "recommended_target": 16,
+        "predicted": {"cpu_ms": 42.0, "peak_bytes": 123456, "observations": 10}
     }
     """
     try:
@@ -164,6 +396,7 @@ def stats():
             'sentences_total': sentences_total,
             'paragraphs_total': paragraphs_total,
             'recommended_target': recommended_target,
+            'predicted': metrics_service.predict(words_total, sentences_total),
             'status': 'success'
         })
     
@@ -0,0 +1,62 @@
+"""
+Debug Routes for CarryOn Summary
+Protected endpoints for inspecting captured request profiles
+"""
+import hmac
+import os
+from functools import wraps
+
+from flask import Blueprint, request, jsonify, send_file
+from backend.services.profiler_service import profiler_service
+from backend.services.differential import shadow_runner
+
+# Create debug blueprint
+debug_bp = Blueprint('debug', __name__, url_prefix='/api/debug')
+
+
+def require_debug_token(view):
+    """Only allow requests carrying the configured X-Debug-Token header"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        expected = os.environ.get('CARRYON_DEBUG_TOKEN', '')
+        if not expected:
+            # Debug endpoints stay hidden unless a token is configured
+            return jsonify({'error': 'Endpoint not found', 'code': 'NOT_FOUND'}), 404
+        provided = request.headers.get('X-Debug-Token', '')
+        if not hmac.compare_digest(provided.encode(), expected.encode()):
+            return jsonify({'error': 'Invalid debug token', 'code': 'FORBIDDEN'}), 403
+        return view(*args, **kwargs)
+    return wrapper
+
+
+@debug_bp.route('/profiles', methods=['GET'])
+@require_debug_token
+def list_profiles():
+    """List captured request profiles, newest first"""
+    return jsonify({
+        'profiles': profiler_service.list_profiles(),
+        'threshold_ms': profiler_service.threshold_ms,
+        'sample_rate': profiler_service.sample_rate,
+        'max_profiles': profiler_service.max_profiles,
+        'status': 'success'
+    })
+
+
+@debug_bp.route('/profiles/<profile_id>', methods=['GET'])
+@require_debug_token
+def download_profile(profile_id):
+    """Download a captured profile (pstats or collapsed stacks)"""
+    path = profiler_service.profile_path(profile_id)
+    if path is None:
+        return jsonify({'error': 'Profile not found', 'code': 'PROFILE_NOT_FOUND'}), 404
+    return send_file(path, as_attachment=True, download_name=path.name)
+
+
+@debug_bp.route('/shadow', methods=['GET'])
+@require_debug_token
+def shadow():
+    """Shadow comparison counters and recent divergences from the reference engine"""
+    return jsonify({
+        **shadow_runner.snapshot(),
+        'status': 'success'
+    })
@@ -2,5 +2,10 @@
 Service layer for CarryOn Summary
 """
 from .summarizer_service import summarizer_service, summarize_text
+from .profiler_service import profiler_service
+from .metrics_service import metrics_service
+from .job_service import job_service
+from .engine_registry import engine_registry
 
-__all__ = ['summarizer_service', 'summarize_text']
\ No newline at end of file
+__all__ = ['summarizer_service', 'summarize_text', 'profiler_service', 'metrics_service', 'job_service',
+           'engine_registry']
\ No newline at end of file
@@ -0,0 +1,174 @@
+"""
+Cancellation
+Cooperative cancellation tokens, and a watcher that trips them when a client disconnects
+"""
+import os
+import select
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class Cancelled(Exception):
+    """Raised at a cancellation checkpoint once the work's token is cancelled"""
+
+    def __init__(self, reason: str = 'cancelled'):
+        super().__init__(f"Summarization cancelled: {reason}")
+        self.reason = reason
+
+
+class CancellationToken:
+    """Flag checked by long-running work at safe points"""
+
+    DEADLINE = 'deadline'
+    DISCONNECTED = 'client disconnected'
+
+    def __init__(self, deadline_ms: Optional[int] = None):
+        """
+        Initialize the token
+
+        Args:
+            deadline_ms: Optional hard limit after which the token counts as
+                cancelled with reason DEADLINE
+        """
+        self.deadline = time.monotonic() + deadline_ms / 1000.0 if deadline_ms else None
+        self.reason: Optional[str] = None
+        self._event = threading.Event()
+
+    def cancel(self, reason: str = 'cancelled') -> None:
+        """Request cancellation; the first reason given is kept"""
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation was requested or the deadline passed"""
+        if not self._event.is_set() and self.deadline is not None and time.monotonic() >= self.deadline:
+            self.cancel(self.DEADLINE)
+        return self._event.is_set()
+
+    def check(self) -> None:
+        """
+        Cancellation checkpoint
+
+        Raises:
+            Cancelled: If the token is cancelled
+        """
+        if self.cancelled:
+            raise Cancelled(self.reason)
+
+
+class SharedCancellation(CancellationToken):
+    """Token for work shared by several callers: cancelled once every caller has cancelled"""
+
+    def __init__(self):
+        super().__init__()
+        self._callers: List[Optional[CancellationToken]] = []
+        self._lock = threading.Lock()
+
+    def join(self, token: Optional[CancellationToken]) -> None:
+        """Add a caller; a caller without a token keeps the work alive"""
+        with self._lock:
+            self._callers.append(token)
+
+    @property
+    def cancelled(self) -> bool:
+        if self._event.is_set():
+            return True
+        with self._lock:
+            callers = list(self._callers)
+        if callers and all(t is not None and t.cancelled for t in callers):
+            self.cancel('all callers cancelled')
+        return self._event.is_set()
+
+
+class DisconnectWatcher:
+    """
+    Background thread that cancels a request's token when its client goes away
+
+    It peeks at the request socket exposed by the WSGI server (gunicorn or
+    the Werkzeug development server). Once the request body has been read, a
+    readable socket with nothing to read means the peer closed it. Servers
+    that don't expose the socket simply aren't watched.
+    """
+
+    SOCKET_KEYS = ('gunicorn.socket', 'werkzeug.socket')
+
+    def __init__(self, interval: float = 0.1):
+        """
+        Initialize the watcher
+
+        Args:
+            interval: Seconds between socket polls
+        """
+        self.interval = interval
+        self._watched: Dict[int, Any] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @contextmanager
+    def watch(self, environ: dict, token: CancellationToken) -> Iterator[None]:
+        """Watch the request's client for the duration of the block"""
+        sock = next((environ[key] for key in self.SOCKET_KEYS if environ.get(key) is not None), None)
+        if sock is None:
+            yield
+            return
+        entry = (sock, token)
+        with self._lock:
+            self._watched[id(entry)] = entry
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='carryon-disconnect', daemon=True)
+                self._thread.start()
+        self._wake.set()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._watched.pop(id(entry), None)
+
+    def _run(self) -> None:
+        """Watcher loop; sleeps while nothing is watched"""
+        while True:
+            with self._lock:
+                entries = list(self._watched.items())
+            if not entries:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            for key, (sock, token) in entries:
+                closed = self._closed(sock)
+                if closed:
+                    token.cancel(CancellationToken.DISCONNECTED)
+                if closed is not False:
+                    with self._lock:
+                        self._watched.pop(key, None)
+            time.sleep(self.interval)
+
+    def _closed(self, sock: socket.socket) -> Optional[bool]:
+        """True if the peer closed the connection, None if that can't be told"""
+        try:
+            readable, _, _ = select.select([sock], [], [], 0)
+            if not readable:
+                return False
+            return sock.recv(1, socket.MSG_PEEK) == b''
+        except (BlockingIOError, InterruptedError):
+            return False
+        except OSError:
+            # Reset or already-closed sockets count as gone
+            return True
+        except (ValueError, TypeError):
+            # TLS sockets refuse MSG_PEEK; stop watching them
+            return None
+
+
+# Hard limit for synchronous /api/summarize requests (0 disables)
+REQUEST_TIMEOUT_MS = int(os.environ.get('CARRYON_REQUEST_TIMEOUT_MS', 0))
+
+# Global disconnect watcher for API requests
+disconnect_watcher = DisconnectWatcher(
+    interval=float(os.environ.get('CARRYON_DISCONNECT_POLL', 0.1))
+)
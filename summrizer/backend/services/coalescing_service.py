@@ -0,0 +1,147 @@
+"""
+Request Coalescing Service
+Single-flight execution: concurrent identical requests share one computation
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from backend.services.cancellation import Cancelled, CancellationToken, SharedCancellation
+
+
+class CoalesceTimeout(Exception):
+    """Raised when a waiter gives up on a shared computation"""
+
+
+class _Call:
+    """An in-flight computation and its outcome"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+        self.waiters = 0
+        # Cancelled only once the leader and every waiter have given up
+        self.cancel = SharedCancellation()
+
+
+class SingleFlight:
+    """Runs at most one computation per key at a time; other callers wait for its result"""
+
+    # Seconds between a caller's checks of its own cancellation token
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, timeout: float = 30.0):
+        """
+        Initialize the single-flight group
+
+        Args:
+            timeout: Seconds a waiter blocks before giving up on the leader
+        """
+        self.timeout = timeout
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self._counts = {'led': 0, 'shared': 0, 'timeouts': 0, 'errors': 0, 'cancelled': 0}
+
+    def do(self, key: str, fn: Callable[[CancellationToken], Any],
+           cancel: Optional[CancellationToken] = None) -> Tuple[Any, bool]:
+        """
+        Run fn, or wait for an identical in-flight call
+
+        Args:
+            key: Identity of the computation
+            fn: Computation to run if nothing is in flight for key; receives
+                a token that is cancelled once every caller sharing it has
+                cancelled
+            cancel: This caller's token; the leader or a waiter stops
+                waiting as soon as it is cancelled, but the computation keeps
+                running for the callers that remain
+
+        Returns:
+            Tuple of (result, shared) where shared is True for waiters
+
+        Raises:
+            CoalesceTimeout: If a waiter times out
+            Cancelled: If this caller's token was cancelled
+            Exception: Whatever the leader's computation raised
+        """
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = _Call()
+                    self._calls[key] = call
+                    self._counts['led'] += 1
+                else:
+                    call.waiters += 1
+                    self._counts['shared'] += 1
+                call.cancel.join(cancel)
+
+            if leader:
+                # Run off this thread so the leader can give up like any waiter
+                # while the computation continues for the others
+                threading.Thread(target=self._run, args=(key, call, fn),
+                                 name='carryon-flight', daemon=True).start()
+                self._wait(call, cancel, timeout=None)
+            else:
+                self._wait(call, cancel, timeout=self.timeout)
+
+            if isinstance(call.error, Cancelled) and not (cancel is not None and cancel.cancelled):
+                # Joined just as everyone else gave up; start a fresh computation
+                continue
+            if call.error is not None:
+                raise call.error
+            return call.result, not leader
+
+    def _run(self, key: str, call: _Call, fn: Callable[[CancellationToken], Any]) -> None:
+        """Computation thread: run fn, record its outcome and release the key"""
+        try:
+            call.result = fn(call.cancel)
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self._counts['cancelled' if isinstance(e, Cancelled) else 'errors'] += 1
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def _wait(self, call: _Call, cancel: Optional[CancellationToken], timeout: Optional[float]) -> None:
+        """Block a caller until the call finishes, it times out, or its own token is cancelled"""
+        give_up = time.monotonic() + timeout if timeout is not None else None
+        while not call.done.wait(self.POLL_INTERVAL if give_up is None else
+                                 min(self.POLL_INTERVAL, max(0.0, give_up - time.monotonic()))):
+            if cancel is not None and cancel.cancelled:
+                raise Cancelled(cancel.reason)
+            if give_up is not None and time.monotonic() >= give_up:
+                with self._lock:
+                    self._counts['timeouts'] += 1
+                raise CoalesceTimeout(f"Identical request did not finish within {self.timeout:g}s")
+
+    def snapshot(self) -> dict:
+        """Counters and current in-flight keys"""
+        with self._lock:
+            return {**self._counts, 'in_flight': len(self._calls), 'timeout': self.timeout}
+
+
+def request_key(text: str, **params) -> str:
+    """
+    Hash a request's normalized input and parameters
+
+    Only line endings and surrounding whitespace are normalized; everything
+    else can change which sentences are selected.
+    """
+    normalized = (text or '').replace('\r\n', '\n').replace('\r', '\n').strip()
+    digest = hashlib.sha256(normalized.encode('utf-8', 'surrogatepass'))
+    digest.update(json.dumps(params, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+
+# Global single-flight group for /api/summarize
+summarize_flight = SingleFlight(
+    timeout=float(os.environ.get('CARRYON_COALESCE_TIMEOUT', 30))
+)
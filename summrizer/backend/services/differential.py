@@ -0,0 +1,319 @@
+"""
+Differential Testing
+Runs the reference and optimized summarizers side by side and reports divergences,
+either offline over generated inputs or as sampled shadow traffic in the API
+"""
+import argparse
+import logging
+import os
+import random
+import re
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from backend.services.reference_summarizer import ReferenceSummarizer
+from backend.services.summarizer_service import summarizer_service
+
+logger = logging.getLogger(__name__)
+
+# Metadata both engines must agree on
+COMPARED_META = ('words_total', 'sentences_total', 'chunks', 'target_sentences', 'reduce_levels')
+
+VOCAB = (
+    "auth migration deploy server cache token build test file function code error "
+    "session database schema rollback config request response worker queue index "
+    "the of and to in is for with on that"
+).split()
+UNICODE_WORDS = ["café", "naïve", "über", "東京", "日本語", "Ωmega", "emoji🙂", "résumé", "ß", "İstanbul"]
+
+
+def _sentence(rng: random.Random, words: List[str], low: int = 4, high: int = 18) -> str:
+    """Random capitalized sentence with terminal punctuation"""
+    body = " ".join(rng.choice(words) for _ in range(rng.randint(low, high)))
+    return body[:1].upper() + body[1:] + rng.choice(".!?")
+
+
+def _text_with_words(rng: random.Random, n_words: int) -> str:
+    """Text containing exactly n_words summarizer words"""
+    sentences: List[str] = []
+    remaining = n_words
+    while remaining > 0:
+        size = min(remaining, rng.randint(4, 18))
+        body = " ".join(rng.choice(VOCAB) for _ in range(size))
+        sentences.append(body[:1].upper() + body[1:] + ".")
+        remaining -= size
+    return " ".join(sentences)
+
+
+def generate_cases(seed: int = 0, random_cases: int = 50) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (name, text) inputs covering known edge cases plus random structure
+
+    Args:
+        seed: Seed for reproducible generation
+        random_cases: Number of property-style random inputs
+    """
+    rng = random.Random(seed)
+    yield 'empty', ''
+    yield 'whitespace', ' \n\t \n'
+    yield 'punctuation_only', '... !!! ??? --- ***'
+    yield 'single_sentence', 'Deploy the auth service.'
+    yield 'empty_sentences', '. . ! ? Deploy now.. . \n\n . Then test! ? .'
+    yield 'unicode', " ".join(_sentence(rng, UNICODE_WORDS + VOCAB) for _ in range(60))
+    yield 'unicode_only', " ".join(_sentence(rng, UNICODE_WORDS) for _ in range(30))
+    yield 'bullet_list', "\n".join(f"- Step {i}: {_sentence(rng, VOCAB)}" for i in range(80))
+    yield 'numbered_list', "\n".join(f"{i}. {_sentence(rng, VOCAB)}" for i in range(1, 120))
+    yield 'huge_paragraph', " ".join(rng.choice(VOCAB) for _ in range(6000))
+    yield 'huge_paragraph_newlines', "\n".join(" ".join(rng.choice(VOCAB) for _ in range(400)) for _ in range(12))
+    for n_words in (1799, 1800, 1801, 1999, 2000, 2001, 3599, 3600, 3601, 1800 * 8, 1800 * 9 + 1):
+        yield f'boundary_{n_words}_words', _text_with_words(rng, n_words)
+
+    for i in range(random_cases):
+        n_sentences = rng.choice((1, 5, 40, 200, 600))
+        parts: List[str] = []
+        for _ in range(n_sentences):
+            roll = rng.random()
+            if roll < 0.05:
+                parts.append(rng.choice(('', '.', '\n\n', ' - ', ':')))
+            elif roll < 0.15:
+                parts.append('- ' + _sentence(rng, VOCAB))
+            elif roll < 0.2:
+                parts.append(_sentence(rng, UNICODE_WORDS + VOCAB))
+            else:
+                parts.append(_sentence(rng, VOCAB))
+        yield f'random_{i}', rng.choice((' ', '\n', '\n\n')).join(parts)
+
+
+def _sentences(summary: str) -> List[str]:
+    """Recover summary sentences for reporting (paragraphs hold up to 4)"""
+    return [s for s in re.split(r"(?<=[.!?])\s+(?=[A-Z0-9])|\n+", summary) if s.strip()]
+
+
+def compare(reference_result: Tuple[str, dict], candidate_result: Tuple[str, dict]) -> Optional[dict]:
+    """
+    Compare two (summary, meta) results
+
+    Returns:
+        None when they agree, otherwise a divergence report
+    """
+    ref_summary, ref_meta = reference_result
+    cand_summary, cand_meta = candidate_result
+    report: dict = {}
+
+    if ref_summary != cand_summary:
+        ref_sents = _sentences(ref_summary)
+        cand_sents = _sentences(cand_summary)
+        missing = [s for s in ref_sents if s not in cand_sents]
+        extra = [s for s in cand_sents if s not in ref_sents]
+        if not missing and not extra:
+            report['kind'] = 'ordering' if ref_sents != cand_sents else 'formatting'
+        else:
+            report['kind'] = 'selection'
+            report['missing'] = missing
+            report['extra'] = extra
+
+    meta_diff = {
+        key: {'reference': ref_meta.get(key), 'candidate': cand_meta.get(key)}
+        for key in COMPARED_META
+        if key in ref_meta and key in cand_meta and ref_meta[key] != cand_meta[key]
+    }
+    if meta_diff:
+        report.setdefault('kind', 'meta')
+        report['meta'] = meta_diff
+
+    return report or None
+
+
+def run_differential(reference: Callable, candidate: Callable,
+                     cases: Iterator[Tuple[str, str]],
+                     targets: Tuple[Optional[int], ...] = (None, 4, 16, 80)) -> dict:
+    """
+    Run both engines over every case and target
+
+    Args:
+        reference: Callable (text, target_sentences) -> (summary, meta)
+        candidate: Callable with the same signature
+        cases: (name, text) inputs
+        targets: target_sentences values to try per case
+
+    Returns:
+        Report with run counts and divergences
+    """
+    runs = 0
+    divergences: List[dict] = []
+    for name, text in cases:
+        for target in targets:
+            runs += 1
+            try:
+                ref_result = reference(text, target)
+            except Exception as e:
+                ref_result = None
+                ref_error = repr(e)
+            try:
+                cand_result = candidate(text, target)
+            except Exception as e:
+                cand_result = None
+                cand_error = repr(e)
+
+            if ref_result is None or cand_result is None:
+                if ref_result is not None or cand_result is not None:
+                    divergences.append({
+                        'case': name, 'target_sentences': target, 'kind': 'exception',
+                        'reference_error': ref_error if ref_result is None else None,
+                        'candidate_error': cand_error if cand_result is None else None
+                    })
+                continue
+
+            report = compare(ref_result, cand_result)
+            if report:
+                divergences.append({'case': name, 'target_sentences': target, **report})
+    return {'runs': runs, 'divergent': len(divergences), 'divergences': divergences}
+
+
+def run_hypothesis(reference: Callable, candidate: Callable, max_examples: int = 200) -> None:
+    """
+    Property-based check with hypothesis, which shrinks any counterexample
+
+    Raises:
+        ImportError: If hypothesis is not installed
+        AssertionError: With the shrunk divergence
+    """
+    from hypothesis import given, settings, strategies as st
+
+    words = st.sampled_from(VOCAB + UNICODE_WORDS + ['-', ':', '1.', '2024'])
+    sentence = st.lists(words, min_size=0, max_size=20).map(" ".join).flatmap(
+        lambda body: st.sampled_from(('.', '!', '?', '', '\n')).map(lambda end: body + end)
+    )
+    texts = st.lists(sentence, max_size=300).flatmap(
+        lambda parts: st.sampled_from((' ', '\n', '\n\n')).map(lambda sep: sep.join(parts))
+    )
+
+    @settings(max_examples=max_examples, deadline=None)
+    @given(text=texts, target=st.one_of(st.none(), st.integers(4, 80)))
+    def agree(text, target):
+        report = compare(reference(text, target), candidate(text, target))
+        assert report is None, report
+
+    agree()
+
+
+class ShadowRunner:
+    """Re-runs a sampled fraction of live requests through an alternate engine off the request path"""
+
+    def __init__(self, engine: Optional[Callable] = None, sample_rate: float = 0.0, max_reports: int = 50):
+        """
+        Initialize the shadow runner
+
+        Args:
+            engine: Callable (text, target_sentences) -> (summary, meta) to compare against
+            sample_rate: Fraction of eligible requests to shadow (0 disables)
+            max_reports: Most recent divergences kept in memory
+        """
+        self.engine = engine
+        self.sample_rate = sample_rate
+        self._reports: deque = deque(maxlen=max_reports)
+        self._lock = threading.Lock()
+        self._inflight = threading.Semaphore(1)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._counts = {'shadowed': 0, 'divergent': 0, 'skipped_busy': 0, 'errors': 0}
+
+    @property
+    def enabled(self) -> bool:
+        """Whether shadowing is configured"""
+        return self.engine is not None and self.sample_rate > 0
+
+    def maybe_shadow(self, text: str, target_sentences: Optional[int], primary: Tuple[str, dict]) -> None:
+        """
+        Schedule a shadow comparison if this request is sampled
+
+        Only one comparison runs at a time; samples arriving while it is busy
+        are dropped so shadowing never queues work behind live traffic.
+        """
+        if not self.enabled or random.random() >= self.sample_rate:
+            return
+        if not self._inflight.acquire(blocking=False):
+            self._count('skipped_busy')
+            return
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='carryon-shadow')
+        self._executor.submit(self._run, text, target_sentences, primary)
+
+    def _run(self, text: str, target_sentences: Optional[int], primary: Tuple[str, dict]) -> None:
+        """Shadow worker body"""
+        try:
+            report = compare(self.engine(text, target_sentences), primary)
+            self._count('shadowed')
+            if report:
+                self._count('divergent')
+                report = {'target_sentences': target_sentences,
+                          'words_total': primary[1].get('words_total'), **report}
+                self._reports.append(report)
+                logger.warning("Shadow engine diverged: %s", report)
+        except Exception:
+            self._count('errors')
+            logger.exception("Shadow comparison failed")
+        finally:
+            self._inflight.release()
+
+    def _count(self, key: str) -> None:
+        """Increment a counter"""
+        with self._lock:
+            self._counts[key] += 1
+
+    def snapshot(self) -> dict:
+        """Counters and recent divergences"""
+        with self._lock:
+            return {'sample_rate': self.sample_rate, **self._counts, 'recent': list(self._reports)}
+
+
+def _engines() -> Dict[str, Callable]:
+    """Engines compared by the CLI"""
+    from backend.services.summarizer_service import SummarizerService
+
+    return {
+        'reference': ReferenceSummarizer().summarize_text,
+        'optimized': SummarizerService().summarize_text
+    }
+
+
+# Global shadow runner: compares live responses against the reference engine,
+# reducing with the live service's fan-in so reduce_levels line up
+shadow_runner = ShadowRunner(
+    engine=ReferenceSummarizer(fan_in=summarizer_service.fan_in).summarize_text,
+    sample_rate=float(os.environ.get('CARRYON_SHADOW_RATE', 0))
+)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point: python -m backend.services.differential"""
+    parser = argparse.ArgumentParser(description='Differential test of reference vs optimized summarizer')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--cases', type=int, default=50, help='random inputs in addition to edge cases')
+    parser.add_argument('--hypothesis', type=int, default=0, metavar='N',
+                        help='also run N hypothesis examples (requires hypothesis)')
+    args = parser.parse_args(argv)
+
+    engines = _engines()
+    report = run_differential(engines['reference'], engines['optimized'], generate_cases(args.seed, args.cases))
+    for divergence in report['divergences']:
+        print(divergence)
+    print(f"{report['divergent']} divergent of {report['runs']} runs")
+
+    if args.hypothesis:
+        try:
+            run_hypothesis(engines['reference'], engines['optimized'], args.hypothesis)
+            print(f"hypothesis: {args.hypothesis} examples agreed")
+        except ImportError:
+            print("hypothesis is not installed; skipped property-based run")
+        except AssertionError as e:
+            print(f"hypothesis found a divergence: {e}")
+            return 1
+    return 1 if report['divergent'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,249 @@
+"""
+Engine Registry
+Named summarization engines with declared cost and capabilities, and a router
+that picks the cheapest engine meeting a request's needs
+"""
+import logging
+import os
+import re
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from backend.services.cancellation import CancellationToken
+
+logger = logging.getLogger(__name__)
+
+# Engine callable: (text, target_sentences, deadline_ms, focus, cancel) -> (summary, meta)
+SummarizeFn = Callable[[str, Optional[int], Optional[int], Optional[List[str]], Optional[CancellationToken]],
+                       Tuple[str, dict]]
+
+WARMUP_TEXT = " ".join(
+    f"Step {i}: deploy the auth service, run the migration and check the cache. "
+    f"The build passed on server {i} after the token fix."
+    for i in range(40)
+)
+
+
+class UnknownEngine(Exception):
+    """Raised when a request or the configuration names an unregistered engine"""
+
+
+class UnsupportedOption(Exception):
+    """Raised when the requested engine cannot honor a request option"""
+
+
+class Engine:
+    """A summarization implementation and what it costs"""
+
+    # Output quality tiers, best first; the router prefers better tiers
+    QUALITIES = ('full', 'preview')
+
+    def __init__(self, name: str, summarize: SummarizeFn, description: str,
+                 cpu_ms_per_1k_words: float, quality: str = 'full',
+                 options: Iterable[str] = ('deadline_ms', 'focus'),
+                 max_words: Optional[int] = None, routable: bool = True, shadow: bool = False):
+        """
+        Initialize the engine
+
+        Args:
+            name: Registry key, also reported as meta.engine
+            summarize: Callable doing the work
+            description: One-line summary for /api/info
+            cpu_ms_per_1k_words: Estimated CPU cost on uncached input, used by the router
+            quality: One of QUALITIES
+            options: Request options the engine honors
+            max_words: Largest input it should be routed (None for no limit)
+            routable: Whether the router may pick it; otherwise only by name
+            shadow: Whether its responses are comparable to the reference engine
+        """
+        if quality not in self.QUALITIES:
+            raise ValueError(f"quality must be one of {', '.join(self.QUALITIES)}")
+        self.name = name
+        self.summarize = summarize
+        self.description = description
+        self.cpu_ms_per_1k_words = cpu_ms_per_1k_words
+        self.quality = quality
+        self.options = frozenset(options)
+        self.max_words = max_words
+        self.routable = routable
+        self.shadow = shadow
+        self.warmup_ms: Optional[float] = None
+
+    def supports(self, options: Iterable[str]) -> bool:
+        """Whether every given option is honored"""
+        return self.options.issuperset(options)
+
+    def predict_ms(self, words_total: int) -> float:
+        """Predicted CPU time for an input of this size"""
+        return self.cpu_ms_per_1k_words * words_total / 1000
+
+    def to_dict(self) -> dict:
+        """Public description for /api/info"""
+        return {
+            'name': self.name,
+            'description': self.description,
+            'quality': self.quality,
+            'options': sorted(self.options),
+            'cost': {'cpu_ms_per_1k_words': self.cpu_ms_per_1k_words, 'max_words': self.max_words},
+            'routable': self.routable,
+            'warmup_ms': self.warmup_ms
+        }
+
+
+class EngineRegistry:
+    """Registered engines plus the default choice ("auto" routes by cost)"""
+
+    AUTO = 'auto'
+
+    def __init__(self, default: str = 'extractive'):
+        """
+        Initialize the registry
+
+        Args:
+            default: Engine used when a request names none, or AUTO to route
+        """
+        self.default = default
+        self._engines: Dict[str, Engine] = {}
+        self._warmed = False
+
+    def register(self, engine: Engine) -> Engine:
+        """Add an engine, replacing any with the same name"""
+        self._engines[engine.name] = engine
+        return engine
+
+    def get(self, name: str) -> Engine:
+        """
+        Look up an engine by name
+
+        Raises:
+            UnknownEngine: If nothing is registered under name
+        """
+        engine = self._engines.get(name)
+        if engine is None:
+            raise UnknownEngine(f"Unknown engine '{name}'; choose one of {', '.join(self.names())}")
+        return engine
+
+    def names(self) -> List[str]:
+        """Registered engine names plus AUTO"""
+        return list(self._engines) + [self.AUTO]
+
+    def list(self) -> List[dict]:
+        """Public descriptions of every engine"""
+        return [engine.to_dict() for engine in self._engines.values()]
+
+    def warm_up(self) -> None:
+        """Run each engine once on a small sample so the first request doesn't pay for cold caches"""
+        if self._warmed:
+            return
+        self._warmed = True
+        for engine in self._engines.values():
+            started = time.perf_counter()
+            try:
+                engine.summarize(WARMUP_TEXT, None, None, None, None)
+            except Exception:
+                logger.exception("Engine %s failed to warm up", engine.name)
+                continue
+            engine.warmup_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    def select(self, text: str, name: Optional[str] = None, options: Iterable[str] = (),
+               deadline_ms: Optional[int] = None) -> Engine:
+        """
+        Choose the engine for a request
+
+        Args:
+            text: Input text (only measured when routing)
+            name: Requested engine, or None for the default
+            options: Request options that must be honored
+            deadline_ms: Latency budget the routed engine should fit
+
+        Raises:
+            UnknownEngine: If the requested engine does not exist
+            UnsupportedOption: If it cannot honor the options
+        """
+        options = list(options)
+        name = name or self.default
+        if name != self.AUTO:
+            engine = self.get(name)
+            if not engine.supports(options):
+                unsupported = sorted(set(options) - engine.options)
+                raise UnsupportedOption(f"Engine '{name}' does not support {', '.join(unsupported)}")
+            return engine
+        return self.route(len(re.findall(r"[A-Za-z0-9']+", text or "")), options, deadline_ms)
+
+    def route(self, words_total: int, options: Iterable[str] = (),
+              deadline_ms: Optional[int] = None) -> Engine:
+        """
+        Pick the cheapest engine of the best quality tier that fits the budget
+
+        Candidates must be routable, honor the options and accept the input
+        size. Without a deadline the cheapest full-quality engine wins. When
+        no candidate fits the deadline, the one predicted fastest is used.
+        Ties go to the engine registered first.
+        """
+        options = list(options)
+        candidates = sorted(
+            (e for e in self._engines.values()
+             if e.routable and e.supports(options) and (e.max_words is None or words_total <= e.max_words)),
+            key=lambda e: (Engine.QUALITIES.index(e.quality), e.predict_ms(words_total))
+        )
+        if not candidates:
+            return self.get(next(iter(self._engines)))
+        for engine in candidates:
+            if deadline_ms is None or engine.predict_ms(words_total) <= deadline_ms:
+                return engine
+        return min(candidates, key=lambda e: e.predict_ms(words_total))
+
+
+def _register_builtin(registry: EngineRegistry) -> None:
+    """Register the engines shipped with the server"""
+    from backend.services.summarizer_service import SummarizerService, summarizer_service
+    from backend.services.reference_summarizer import ReferenceSummarizer
+
+    # Costs are estimates from single-threaded runs on uncached input; the two
+    # full-quality engines cost about the same, so routing prefers 'extractive'
+    registry.register(Engine(
+        'extractive', summarizer_service.summarize_text,
+        'Frequency-scored extractive summary with fixed chunks and tree reduction',
+        cpu_ms_per_1k_words=9.5,
+        # Only comparable to the reference with fixed chunks and no corpus IDF
+        shadow=summarizer_service.chunking == 'fixed' and not summarizer_service.idf.path
+    ))
+
+    content = SummarizerService(
+        fan_in=summarizer_service.fan_in,
+        trace_memory=summarizer_service.trace_memory,
+        chunking='content',
+        chunk_cache_size=summarizer_service.chunk_cache.max_entries,
+        approx_threshold_words=summarizer_service.approx_threshold_words,
+        idf=summarizer_service.idf
+    )
+    registry.register(Engine(
+        'content', content.summarize_text,
+        'Extractive summary over content-defined chunks; re-summarizing edited text reuses cached chunks',
+        cpu_ms_per_1k_words=9.5
+    ))
+
+    def sampled(text, target_sentences, deadline_ms, focus, cancel):
+        return summarizer_service.summarize_text(text, target_sentences, deadline_ms, None, cancel, sample=True)
+
+    registry.register(Engine(
+        'sampled', sampled,
+        'Evenly spaced sentences without scoring for long inputs; a fast preview',
+        cpu_ms_per_1k_words=1.0, quality='preview', options=('deadline_ms',)
+    ))
+
+    reference = ReferenceSummarizer(fan_in=summarizer_service.fan_in)
+    registry.register(Engine(
+        'reference', lambda text, target_sentences, deadline_ms, focus, cancel:
+            reference.summarize_text(text, target_sentences),
+        'Frozen unoptimized implementation used as ground truth',
+        cpu_ms_per_1k_words=11.0, options=(), routable=False
+    ))
+
+    if registry.default != EngineRegistry.AUTO:
+        registry.get(registry.default)
+
+
+# Global registry: CARRYON_ENGINE picks the default engine, or "auto" to route by cost
+engine_registry = EngineRegistry(default=os.environ.get('CARRYON_ENGINE', 'extractive'))
+_register_builtin(engine_registry)
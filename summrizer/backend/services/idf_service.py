@@ -0,0 +1,153 @@
+"""
+IDF Service
+Memory-mapped corpus IDF and stopword table built by backend.utils.idf_builder,
+reloaded when the file changes
+"""
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# File layout (little-endian):
+#   header: magic, version, flags, slot count (power of two), term count,
+#           documents, idf of unseen terms, largest idf
+#   slots:  term hash (0 marks an empty slot), idf, flags
+# Terms are found by open addressing with linear probing from hash & (slots - 1).
+MAGIC = b'CIDF'
+VERSION = 1
+HEADER = struct.Struct('<4sHHIIQff')
+SLOT = struct.Struct('<QfI')
+STOPWORD = 0x1
+
+
+def term_hash(term: str) -> int:
+    """Stable 64-bit hash of a normalized term; never 0, which marks empty slots"""
+    digest = hashlib.blake2b(term.encode('utf-8', 'surrogatepass'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') or 1
+
+
+class IdfModel:
+    """Read-only view of an IDF file; pages are shared by every process mapping it"""
+
+    def __init__(self, path: str):
+        """
+        Map an IDF file
+
+        Args:
+            path: File written by backend.utils.idf_builder
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If it is not a supported IDF file
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            if stat.st_size < HEADER.size:
+                raise ValueError(f"{path} is too small to be an IDF file")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.tag = f"{stat.st_mtime_ns}:{stat.st_size}"
+
+        magic, version, _, slots, terms, documents, default_idf, max_idf = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an IDF file")
+        if version != VERSION:
+            raise ValueError(f"{path} has IDF format version {version}; expected {VERSION}")
+        if slots & (slots - 1) or len(self._map) != HEADER.size + slots * SLOT.size or max_idf <= 0:
+            raise ValueError(f"{path} is truncated or corrupt")
+        self.version = version
+        self.slots = slots
+        self.terms = terms
+        self.documents = documents
+        self.default_idf = default_idf
+        self.max_idf = max_idf
+
+    def lookup(self, term: str) -> Optional[Tuple[float, bool]]:
+        """Return (idf, is_stopword) for a normalized term, or None if it isn't in the table"""
+        target = term_hash(term)
+        mask = self.slots - 1
+        i = target & mask
+        for _ in range(self.slots):
+            h, idf, flags = SLOT.unpack_from(self._map, HEADER.size + i * SLOT.size)
+            if h == target:
+                return idf, bool(flags & STOPWORD)
+            if h == 0:
+                return None
+            i = (i + 1) & mask
+        return None
+
+    def weight(self, term: str) -> float:
+        """IDF scaled to (0, 1]; 0 for corpus stopwords, the maximum for unseen terms"""
+        entry = self.lookup(term)
+        if entry is None:
+            return self.default_idf / self.max_idf
+        idf, stopword = entry
+        return 0.0 if stopword else idf / self.max_idf
+
+    def as_meta(self) -> dict:
+        """Model identity for response metadata"""
+        return {'version': self.version, 'documents': self.documents, 'terms': self.terms}
+
+
+class IdfService:
+    """Holds the current IDF model and swaps in a new one when its file changes"""
+
+    def __init__(self, path: str = '', check_interval: float = 5.0):
+        """
+        Initialize the service
+
+        Args:
+            path: IDF file to map ('' disables IDF weighting)
+            check_interval: Minimum seconds between checks of the file's mtime
+        """
+        self.path = path
+        self.check_interval = check_interval
+        self._model: Optional[IdfModel] = None
+        self._mtime_ns: Optional[int] = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+        if path:
+            self._reload()
+
+    @property
+    def model(self) -> Optional[IdfModel]:
+        """Current model, reloading first if the file changed since the last check"""
+        if self.path and time.monotonic() - self._checked >= self.check_interval:
+            with self._lock:
+                if time.monotonic() - self._checked >= self.check_interval:
+                    self._reload()
+        return self._model
+
+    def _reload(self) -> None:
+        """Map the file if its mtime changed; keep the previous model on failure (lock held or at init)"""
+        self._checked = time.monotonic()
+        try:
+            mtime_ns = os.stat(self.path).st_mtime_ns
+        except OSError as e:
+            # -1 marks a missing file so it is only reported once
+            if self._mtime_ns != -1:
+                logger.warning("IDF file %s unavailable: %s", self.path, e)
+            self._mtime_ns = -1
+            return
+        if mtime_ns == self._mtime_ns:
+            return
+        self._mtime_ns = mtime_ns
+        try:
+            # The previous mapping is unmapped once no request still holds it
+            self._model = IdfModel(self.path)
+            logger.info("Loaded IDF model %s (%d terms)", self.path, self._model.terms)
+        except (OSError, ValueError) as e:
+            logger.warning("Could not load IDF model %s: %s", self.path, e)
+
+
+# Global IDF service: CARRYON_IDF_PATH points at a file from backend.utils.idf_builder
+idf_service = IdfService(
+    path=os.environ.get('CARRYON_IDF_PATH', ''),
+    check_interval=float(os.environ.get('CARRYON_IDF_RELOAD_SECONDS', 5))
+)
@@ -0,0 +1,200 @@
+"""
+Job Service
+Runs summarization requests on a background worker pool with a bounded result store
+"""
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from backend.services.cancellation import CancellationToken
+
+
+class JobStoreFull(Exception):
+    """Raised when every slot in the result store holds an unfinished job"""
+
+
+class Job:
+    """A single background summarization job"""
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+    FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+    def __init__(self, params: dict):
+        """
+        Initialize a queued job
+
+        Args:
+            params: Summarization parameters the job was submitted with
+        """
+        self.id = uuid.uuid4().hex
+        # Released once the job finishes; the input text can be megabytes
+        self.params: Optional[dict] = params
+        self.status = self.QUEUED
+        self.result: Optional[dict] = None
+        self.error: Optional[str] = None
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.cancel_requested = False
+        self.token = CancellationToken()
+        self.future: Optional[Future] = None
+        self.done = threading.Event()
+
+    @property
+    def is_finished(self) -> bool:
+        """Whether the job reached a terminal state"""
+        return self.status in self.FINISHED
+
+    def to_dict(self) -> dict:
+        """Public representation of the job"""
+        data = {
+            'job_id': self.id,
+            'status': self.status,
+            'created': self.created,
+            'started': self.started,
+            'finished': self.finished
+        }
+        if self.status == self.SUCCEEDED:
+            data['result'] = self.result
+        if self.status == self.FAILED:
+            data['error'] = self.error
+        return data
+
+
+class JobService:
+    """Service class for asynchronous summarization jobs"""
+
+    def __init__(self, workers: int = 2, max_jobs: int = 200, result_ttl: float = 600):
+        """
+        Initialize the job service
+
+        Args:
+            workers: Size of the background worker pool
+            max_jobs: Jobs kept in the store; the oldest finished jobs are evicted first
+            result_ttl: Seconds a finished job's result is kept
+        """
+        self.workers = workers
+        self.max_jobs = max_jobs
+        self.result_ttl = result_ttl
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def submit(self, params: dict, run: Callable[[dict, CancellationToken], Any]) -> Job:
+        """
+        Queue a job
+
+        Args:
+            params: Summarization parameters
+            run: Callable doing the work; receives params and the job's
+                cancellation token and returns the result
+
+        Returns:
+            The queued job
+
+        Raises:
+            JobStoreFull: If no finished job can be evicted to make room
+        """
+        job = Job(params)
+        with self._lock:
+            self._evict()
+            if len(self._jobs) >= self.max_jobs:
+                raise JobStoreFull(f"{self.max_jobs} jobs are already queued or running")
+            self._jobs[job.id] = job
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='carryon-job')
+            job.future = self._executor.submit(self._execute, job, run)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Look up a job by id"""
+        with self._lock:
+            self._evict()
+            return self._jobs.get(job_id)
+
+    def wait(self, job: Job, timeout: float) -> Job:
+        """Block until the job finishes or the timeout passes"""
+        job.done.wait(timeout)
+        return job
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        Cancel a job
+
+        Queued jobs never start. A running job's token is cancelled so the
+        work stops at its next checkpoint; anything it still returns is
+        discarded and it is reported as cancelled.
+        """
+        job = self.get(job_id)
+        if job is None or job.is_finished:
+            return job
+        job.cancel_requested = True
+        job.token.cancel('job cancelled')
+        if job.future is not None and job.future.cancel():
+            self._finish(job, Job.CANCELLED)
+        return job
+
+    def stats(self) -> dict:
+        """Counts of stored jobs by status"""
+        with self._lock:
+            counts: dict = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            return {'jobs': len(self._jobs), 'by_status': counts,
+                    'max_jobs': self.max_jobs, 'workers': self.workers}
+
+    def _execute(self, job: Job, run: Callable[[dict, CancellationToken], Any]) -> None:
+        """Worker entry point"""
+        if job.cancel_requested:
+            self._finish(job, Job.CANCELLED)
+            return
+        with self._lock:
+            job.started = time.time()
+            job.status = Job.RUNNING
+        try:
+            result = run(job.params, job.token)
+        except Exception as e:
+            job.error = str(e)
+            self._finish(job, Job.CANCELLED if job.cancel_requested else Job.FAILED)
+            return
+        if job.cancel_requested:
+            self._finish(job, Job.CANCELLED)
+        else:
+            job.result = result
+            self._finish(job, Job.SUCCEEDED)
+
+    def _finish(self, job: Job, status: str) -> None:
+        """Move a job to a terminal state and wake waiters"""
+        # Under the lock, so _evict never sees a finished status without a finish time
+        with self._lock:
+            job.finished = time.time()
+            job.status = status
+            job.params = None
+        job.done.set()
+
+    def _evict(self) -> None:
+        """Drop expired results, then the oldest finished jobs while over capacity (lock held)"""
+        now = time.time()
+        for job_id in [j.id for j in self._jobs.values() if j.is_finished and now - j.finished > self.result_ttl]:
+            del self._jobs[job_id]
+        if len(self._jobs) >= self.max_jobs:
+            for job_id in [j.id for j in self._jobs.values() if j.is_finished]:
+                del self._jobs[job_id]
+                if len(self._jobs) < self.max_jobs:
+                    break
+
+
+# Global service instance
+job_service = JobService(
+    workers=int(os.environ.get('CARRYON_JOB_WORKERS', 2)),
+    max_jobs=int(os.environ.get('CARRYON_JOB_MAX', 200)),
+    result_ttl=float(os.environ.get('CARRYON_JOB_TTL', 600))
+)
@@ -0,0 +1,257 @@
+"""
+Metrics Service
+Per-request memory accounting and a cost model for predicting request cost
+"""
+import os
+import re
+import sys
+import threading
+import tracemalloc
+from typing import Dict, List, Optional
+
+# Only one request can own tracemalloc's peak counter at a time
+_trace_lock = threading.Lock()
+
+
+class MemoryMeter:
+    """
+    Tracks memory per summarization stage for a single request
+
+    Stage sizes are working memory on top of the input text itself.
+    """
+
+    def __init__(self, trace: bool = False):
+        """
+        Initialize the meter
+
+        Args:
+            trace: Measure with tracemalloc instead of estimating from live
+                data sizes. Tracing is exact but slows the request several
+                times over, and only one request is traced at a time.
+        """
+        self.stages: Dict[str, int] = {}
+        self.trace = trace and _trace_lock.acquire(blocking=False)
+        self.method = 'tracemalloc' if self.trace else 'estimate'
+        self._owns_tracing = False
+        self._base = 0
+        if self.trace:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owns_tracing = True
+            tracemalloc.reset_peak()
+            self._base = tracemalloc.get_traced_memory()[0]
+
+    @property
+    def peak_bytes(self) -> int:
+        """Largest stage footprint seen so far"""
+        return max(self.stages.values(), default=0)
+
+    def record(self, stage: str, estimated_bytes: int) -> None:
+        """
+        Record the memory used by a stage
+
+        Args:
+            stage: Stage name
+            estimated_bytes: Live working data size during the stage; ignored
+                when tracing, where the traced peak since the last record is used
+        """
+        if self.trace:
+            _, peak = tracemalloc.get_traced_memory()
+            nbytes = peak - self._base
+            tracemalloc.reset_peak()
+        else:
+            nbytes = estimated_bytes
+        self.stages[stage] = max(self.stages.get(stage, 0), nbytes)
+
+    def close(self) -> None:
+        """Release tracemalloc if this meter started it"""
+        if self.trace:
+            if self._owns_tracing:
+                tracemalloc.stop()
+            _trace_lock.release()
+            self.trace = False
+            self._owns_tracing = False
+
+    def as_meta(self) -> dict:
+        """Summary suitable for response metadata"""
+        return {
+            'peak_bytes': self.peak_bytes,
+            'stages': dict(self.stages),
+            'method': self.method
+        }
+
+
+class CostModel:
+    """
+    Online least-squares model mapping input shape to CPU time and peak memory
+
+    Features are (1, words_total, sentences_total). Until enough requests
+    have been observed, predictions come from prior coefficients measured
+    on synthetic chat transcripts.
+    """
+
+    FEATURES = ('intercept', 'words_total', 'sentences_total')
+    TARGETS = ('cpu_ms', 'peak_bytes')
+    PRIOR = {
+        'cpu_ms': [1.0, 0.007, 0.0],
+        'peak_bytes': [4096.0, 64.0, 0.0]
+    }
+    MIN_OBSERVATIONS = 8
+    # Ridge term keeps the normal equations solvable on collinear inputs
+    RIDGE = 1e-6
+
+    def __init__(self):
+        """Initialize an empty model"""
+        size = len(self.FEATURES)
+        self.observations = 0
+        self._xtx = [[0.0] * size for _ in range(size)]
+        self._xty = {t: [0.0] * size for t in self.TARGETS}
+        self._coefficients = {t: list(c) for t, c in self.PRIOR.items()}
+        self._lock = threading.Lock()
+
+    def _features(self, words_total: int, sentences_total: int) -> List[float]:
+        """Feature vector for an input"""
+        return [1.0, float(words_total), float(sentences_total)]
+
+    def observe(self, words_total: int, sentences_total: int, cpu_ms: float, peak_bytes: int) -> None:
+        """Add one measured request to the model"""
+        x = self._features(words_total, sentences_total)
+        y = {'cpu_ms': float(cpu_ms), 'peak_bytes': float(peak_bytes)}
+        with self._lock:
+            for i, xi in enumerate(x):
+                for j, xj in enumerate(x):
+                    self._xtx[i][j] += xi * xj
+                for t in self.TARGETS:
+                    self._xty[t][i] += xi * y[t]
+            self.observations += 1
+            if self.observations >= self.MIN_OBSERVATIONS:
+                for t in self.TARGETS:
+                    solved = self._solve(self._xtx, self._xty[t])
+                    if solved is not None:
+                        self._coefficients[t] = solved
+
+    def predict(self, words_total: int, sentences_total: int) -> dict:
+        """Predict CPU time and peak memory for an input"""
+        x = self._features(words_total, sentences_total)
+        with self._lock:
+            coefficients = {t: list(c) for t, c in self._coefficients.items()}
+        return {
+            'cpu_ms': round(max(0.0, sum(c * xi for c, xi in zip(coefficients['cpu_ms'], x))), 1),
+            'peak_bytes': int(max(0.0, sum(c * xi for c, xi in zip(coefficients['peak_bytes'], x)))),
+            'observations': self.observations
+        }
+
+    def coefficients(self) -> dict:
+        """Current coefficients by target and feature"""
+        with self._lock:
+            return {
+                t: dict(zip(self.FEATURES, self._coefficients[t]))
+                for t in self.TARGETS
+            }
+
+    def _solve(self, a: List[List[float]], b: List[float]) -> Optional[List[float]]:
+        """Solve (A + ridge*I) x = b by Gaussian elimination with partial pivoting"""
+        n = len(b)
+        scale = max(abs(a[i][i]) for i in range(n)) or 1.0
+        m = [
+            [a[i][j] + (self.RIDGE * scale if i == j else 0.0) for j in range(n)] + [b[i]]
+            for i in range(n)
+        ]
+        for col in range(n):
+            pivot = max(range(col, n), key=lambda r: abs(m[r][col]))
+            if abs(m[pivot][col]) < 1e-12:
+                return None
+            m[col], m[pivot] = m[pivot], m[col]
+            for r in range(n):
+                if r != col:
+                    factor = m[r][col] / m[col][col]
+                    for c in range(col, n + 1):
+                        m[r][c] -= factor * m[col][c]
+        return [m[i][n] / m[i][i] for i in range(n)]
+
+
+class MetricsService:
+    """Service class for request cost metrics"""
+
+    # Engines whose full runs the cost model predicts; previews and the
+    # reference implementation cost something else entirely
+    MODELED_ENGINES = ('extractive', 'content')
+
+    def __init__(self, max_request_bytes: int = 0):
+        """
+        Initialize the metrics service
+
+        Args:
+            max_request_bytes: Reject requests predicted to exceed this (0 disables)
+        """
+        self.max_request_bytes = max_request_bytes
+        self.cost_model = CostModel()
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._cpu_ms_total = 0.0
+        self._peak_bytes_max = 0
+
+    def text_shape(self, text: str) -> dict:
+        """Cheap structural features of an input, matching what the model is fit on"""
+        text = text or ""
+        sentences = re.split(r"(?<=[.!?])\s+(?=[A-Z0-9])|\n+", text.strip())
+        return {
+            'words_total': len(re.findall(r"[A-Za-z0-9']+", text)),
+            'sentences_total': len([s for s in sentences if s.strip()])
+        }
+
+    def predict(self, words_total: int, sentences_total: int) -> dict:
+        """Predict CPU time and peak memory before summarizing"""
+        return self.cost_model.predict(words_total, sentences_total)
+
+    def exceeds_cap(self, prediction: dict, text: str) -> bool:
+        """Whether a predicted request would break the memory cap"""
+        if not self.max_request_bytes:
+            return False
+        return prediction['peak_bytes'] + sys.getsizeof(text) > self.max_request_bytes
+
+    def observe(self, meta: dict) -> None:
+        """Record a finished request's measured cost from its metadata"""
+        memory = meta.get('memory') or {}
+        cpu_ms = meta.get('cpu_ms')
+        if cpu_ms is None or 'peak_bytes' not in memory:
+            return
+        with self._lock:
+            self._requests += 1
+            self._cpu_ms_total += cpu_ms
+            self._peak_bytes_max = max(self._peak_bytes_max, memory['peak_bytes'])
+        if not self._full_run(meta):
+            return
+        self.cost_model.observe(
+            meta.get('words_total', 0), meta.get('sentences_total', 0),
+            cpu_ms, memory['peak_bytes']
+        )
+
+    def _full_run(self, meta: dict) -> bool:
+        """Whether a request paid the full cost: a modeled engine, nothing sampled or cached"""
+        return (meta.get('engine', self.MODELED_ENGINES[0]) in self.MODELED_ENGINES
+                and not meta.get('degraded') and not meta.get('chunk_cache_hits'))
+
+    def snapshot(self) -> dict:
+        """Aggregate metrics and current model coefficients"""
+        with self._lock:
+            requests = self._requests
+            cpu_ms_total = self._cpu_ms_total
+            peak_bytes_max = self._peak_bytes_max
+        return {
+            'requests': requests,
+            'cpu_ms_total': round(cpu_ms_total, 1),
+            'cpu_ms_avg': round(cpu_ms_total / requests, 1) if requests else 0.0,
+            'peak_bytes_max': peak_bytes_max,
+            'max_request_bytes': self.max_request_bytes,
+            'cost_model': {
+                'observations': self.cost_model.observations,
+                'coefficients': self.cost_model.coefficients()
+            }
+        }
+
+
+# Global service instance
+metrics_service = MetricsService(
+    max_request_bytes=int(os.environ.get('CARRYON_MAX_REQUEST_BYTES', 0))
+)
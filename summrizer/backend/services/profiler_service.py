@@ -0,0 +1,212 @@
+"""
+Request Profiling Service
+Captures profiles of slow or sampled requests into a bounded on-disk ring buffer
+"""
+import cProfile
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+
+class StackSampler:
+    """Background thread that periodically samples the stacks of watched threads"""
+
+    def __init__(self, interval: float = 0.005):
+        """
+        Initialize the sampler
+
+        Args:
+            interval: Seconds between samples
+        """
+        self.interval = interval
+        self._watched: Dict[int, Counter] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def watch(self, thread_id: int) -> Counter:
+        """Start collecting collapsed stacks for a thread"""
+        stacks: Counter = Counter()
+        with self._lock:
+            self._watched[thread_id] = stacks
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='carryon-stack-sampler', daemon=True)
+                self._thread.start()
+        return stacks
+
+    def unwatch(self, thread_id: int) -> None:
+        """Stop collecting stacks for a thread"""
+        with self._lock:
+            self._watched.pop(thread_id, None)
+
+    def _run(self) -> None:
+        """Sampling loop; exits once nothing is being watched"""
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._watched:
+                    self._thread = None
+                    return
+                watched = dict(self._watched)
+            frames = sys._current_frames()
+            for thread_id, stacks in watched.items():
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    stacks[self._collapse(frame)] += 1
+
+    def _collapse(self, frame) -> str:
+        """Render a frame chain in collapsed (flamegraph) format, root first"""
+        names: List[str] = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{Path(code.co_filename).name}:{code.co_name}:{frame.f_lineno}")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+
+class ProfilerService:
+    """Service class for opt-in request profiling"""
+
+    PROFILE_ID = re.compile(r"^[0-9]+-[0-9a-f]{8}$")
+
+    def __init__(self, threshold_ms: float = 0, sample_rate: float = 0.0,
+                 directory: Optional[str] = None, max_profiles: int = 50):
+        """
+        Initialize the profiler service
+
+        Args:
+            threshold_ms: Keep a stack-sampled profile of requests slower than this (0 disables)
+            sample_rate: Fraction of requests to profile with cProfile (0 disables)
+            directory: Where profiles are stored
+            max_profiles: Ring buffer size; oldest profiles are deleted beyond it
+        """
+        self.threshold_ms = threshold_ms
+        self.sample_rate = sample_rate
+        self.directory = Path(directory or Path(tempfile.gettempdir()) / 'carryon-profiles')
+        self.max_profiles = max_profiles
+        self._sampler = StackSampler()
+        # cProfile can only run one profiler at a time per process
+        self._cprofile_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any capture mode is configured"""
+        return self.threshold_ms > 0 or self.sample_rate > 0
+
+    @contextmanager
+    def profile(self, name: str) -> Iterator[dict]:
+        """
+        Profile the wrapped block if it is sampled or turns out to be slow
+
+        Args:
+            name: Label for the profiled operation
+
+        Yields:
+            Metadata dict the caller can fill in (words_total, chunks, ...)
+        """
+        metadata: dict = {}
+        if not self.enabled:
+            yield metadata
+            return
+
+        profiler = None
+        if self.sample_rate > 0 and random.random() < self.sample_rate and self._cprofile_lock.acquire(blocking=False):
+            profiler = cProfile.Profile()
+
+        thread_id = threading.get_ident()
+        stacks = self._sampler.watch(thread_id) if profiler is None and self.threshold_ms > 0 else None
+        started = time.perf_counter()
+        try:
+            if profiler is not None:
+                profiler.enable()
+            yield metadata
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if profiler is not None:
+                profiler.disable()
+                self._cprofile_lock.release()
+                self._save(name, 'sampled', elapsed_ms, metadata, profiler=profiler)
+            elif stacks is not None:
+                self._sampler.unwatch(thread_id)
+                if elapsed_ms >= self.threshold_ms:
+                    self._save(name, 'slow', elapsed_ms, metadata, stacks=stacks)
+
+    def list_profiles(self) -> List[dict]:
+        """List stored profiles, newest first"""
+        if not self.directory.exists():
+            return []
+        profiles = []
+        for meta_path in self.directory.glob('*.json'):
+            try:
+                profiles.append(json.loads(meta_path.read_text()))
+            except (OSError, ValueError):
+                continue
+        return sorted(profiles, key=lambda p: p.get('created', 0), reverse=True)
+
+    def profile_path(self, profile_id: str) -> Optional[Path]:
+        """Resolve the profile data file for an id, or None if unknown"""
+        if not self.PROFILE_ID.match(profile_id or ''):
+            return None
+        for suffix in ('.prof', '.stacks'):
+            path = self.directory / f"{profile_id}{suffix}"
+            if path.exists():
+                return path
+        return None
+
+    def _save(self, name: str, reason: str, elapsed_ms: float, metadata: dict,
+              profiler: Optional[cProfile.Profile] = None, stacks: Optional[Counter] = None) -> None:
+        """Write a profile and its metadata, then trim the ring buffer"""
+        profile_id = f"{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}"
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            if profiler is not None:
+                data_path = self.directory / f"{profile_id}.prof"
+                profiler.dump_stats(str(data_path))
+            else:
+                data_path = self.directory / f"{profile_id}.stacks"
+                data_path.write_text("".join(f"{stack} {count}\n" for stack, count in (stacks or {}).items()))
+
+            record = {
+                'id': profile_id,
+                'name': name,
+                'reason': reason,
+                'format': 'pstats' if profiler is not None else 'collapsed',
+                'elapsed_ms': round(elapsed_ms, 1),
+                'created': time.time(),
+                'metadata': metadata
+            }
+            (self.directory / f"{profile_id}.json").write_text(json.dumps(record))
+            self._trim()
+        except OSError:
+            # Profiling must never break the request it observes
+            pass
+
+    def _trim(self) -> None:
+        """Delete the oldest profiles beyond max_profiles"""
+        with self._write_lock:
+            records = sorted(self.directory.glob('*.json'), key=lambda p: p.name)
+            for meta_path in records[:max(0, len(records) - self.max_profiles)]:
+                for path in self.directory.glob(f"{meta_path.stem}.*"):
+                    try:
+                        path.unlink()
+                    except OSError:
+                        pass
+
+
+# Global service instance
+profiler_service = ProfilerService(
+    threshold_ms=float(os.environ.get('CARRYON_PROFILE_THRESHOLD_MS', 0)),
+    sample_rate=float(os.environ.get('CARRYON_PROFILE_SAMPLE_RATE', 0)),
+    directory=os.environ.get('CARRYON_PROFILE_DIR'),
+    max_profiles=int(os.environ.get('CARRYON_PROFILE_MAX', 50))
+)
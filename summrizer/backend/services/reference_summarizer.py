@@ -0,0 +1,171 @@
+"""
+Reference Summarizer
+Frozen, deliberately unoptimized copy of the extractive algorithm used as
+ground truth for differential testing. Do not optimize or extend this
+module; change SummarizerService instead and prove it still agrees.
+"""
+import re
+from collections import Counter
+from typing import List, Optional, Tuple
+
+# (position, text, words)
+Sentence = Tuple[int, str, List[str]]
+
+
+class ReferenceSummarizer:
+    """Straightforward implementation of the summarization semantics"""
+
+    STOPWORDS = {
+        "a", "an", "the", "and", "or", "but", "if", "while", "with", "without",
+        "of", "to", "in", "on", "for", "from", "by", "as", "at", "that", "this",
+        "these", "those", "it", "its", "is", "are", "was", "were", "be", "been",
+        "being", "has", "have", "had", "do", "does", "did", "can", "could",
+        "should", "would", "may", "might", "must", "will", "just", "also",
+        "not", "no", "nor", "so", "than", "then", "too", "very"
+    }
+
+    def __init__(self, fan_in: int = 8):
+        """
+        Initialize the reference summarizer
+
+        Args:
+            fan_in: Chunk summaries merged per group in the tree reduction
+        """
+        self.fan_in = fan_in
+
+    def summarize_text(self, text: str, target_sentences: Optional[int] = 16) -> Tuple[str, dict]:
+        """
+        Summarize text
+
+        Args:
+            text: Input text to summarize
+            target_sentences: Target number of sentences (None for auto-size)
+
+        Returns:
+            Tuple of (summary_text, metadata)
+        """
+        text = text or ""
+        words_total = len(re.findall(r"[A-Za-z0-9']+", text))
+        if words_total == 0:
+            return "", {"words_total": 0, "sentences_total": 0, "chunks": 0,
+                        "target_sentences": target_sentences or 0}
+
+        if target_sentences is None:
+            target_sentences = self._auto_target(words_total)
+
+        if words_total <= 2000:
+            sentences = self._tokenize(self._to_sentences(text), 0)
+            selected = self._select(sentences, target_sentences)
+            return self._to_paragraphs([s[1] for s in selected]), {
+                "words_total": words_total,
+                "sentences_total": len(sentences),
+                "chunks": 1,
+                "target_sentences": target_sentences
+            }
+
+        chunks = self._chunk(text, 1800)
+        per_chunk = max(8, target_sentences // 2)
+        groups: List[List[Sentence]] = []
+        position = 0
+        for chunk in chunks:
+            sentences = self._tokenize(self._to_sentences(chunk), position)
+            position += len(sentences)
+            groups.append(self._select(sentences, per_chunk))
+
+        levels = 1
+        while len(groups) > self.fan_in:
+            groups = [
+                self._select([s for g in groups[i:i + self.fan_in] for s in g], target_sentences)
+                for i in range(0, len(groups), self.fan_in)
+            ]
+            levels += 1
+
+        selected = self._select([s for g in groups for s in g], target_sentences)
+        return self._to_paragraphs([s[1] for s in selected]), {
+            "words_total": words_total,
+            "sentences_total": position,
+            "chunks": len(chunks),
+            "target_sentences": target_sentences,
+            "reduce_levels": levels
+        }
+
+    def _to_sentences(self, text: str) -> List[str]:
+        """Split text into sentences"""
+        text = re.sub(r"\s+", " ", text or "").strip()
+        if not text:
+            return []
+        parts = re.split(r"(?<=[.!?])\s+(?=[A-Z0-9])|\n+", text)
+        return [s.strip() for s in parts if s and len(s.strip()) > 1]
+
+    def _tokenize(self, sentences: List[str], start: int) -> List[Sentence]:
+        """Attach positions and word tokens"""
+        return [(start + i, s, re.findall(r"[A-Za-z0-9']+", s)) for i, s in enumerate(sentences)]
+
+    def _normalize(self, word: str) -> str:
+        """Normalize word for frequency analysis"""
+        return re.sub(r"[^a-z0-9]", "", word.lower())
+
+    def _select(self, sentences: List[Sentence], target_count: int) -> List[Sentence]:
+        """Keep the top-scoring sentences in document order"""
+        if target_count <= 0:
+            return []
+        if len(sentences) <= target_count:
+            return sentences
+
+        freq = Counter(
+            n for s in sentences for n in (self._normalize(w) for w in s[2])
+            if n and n not in self.STOPWORDS
+        )
+        if freq:
+            max_f = max(freq.values())
+            freq = Counter({k: v / max_f for k, v in freq.items()})
+
+        scored = [(s, self._score(s[1], s[2], freq)) for s in sentences]
+        top = sorted(scored, key=lambda x: x[1], reverse=True)[:target_count]
+        return [s for s, _ in sorted(top, key=lambda x: x[0][0])]
+
+    def _score(self, sentence: str, words: List[str], freq: Counter) -> float:
+        """Frequency score plus number, capitalization and structure bonuses"""
+        if not words:
+            return 0.0
+        base = sum(freq.get(self._normalize(w), 0.0) for w in words)
+        bonus = 0.0
+        for w in words:
+            if re.match(r"^[0-9]", w):
+                bonus += 0.05
+            elif re.match(r"^[A-Z][a-zA-Z0-9]*", w):
+                bonus += 0.03
+        if re.search(r"(^[-*•]\s)|(:)", sentence):
+            bonus += 0.06
+        return (base + bonus) / (len(words) ** 0.5)
+
+    def _chunk(self, text: str, max_words: int) -> List[str]:
+        """Cut text every max_words words"""
+        chunks: List[str] = []
+        current: List[str] = []
+        count = 0
+        for token in re.findall(r"[A-Za-z0-9']+|\s+|\S", text):
+            current.append(token)
+            if re.match(r"[A-Za-z0-9']+", token):
+                count += 1
+            if count >= max_words:
+                chunks.append("".join(current).strip())
+                current = []
+                count = 0
+        if current:
+            chunks.append("".join(current).strip())
+        return chunks
+
+    def _auto_target(self, words_total: int) -> int:
+        """Target sentence count by input length"""
+        for limit, target in ((180, 6), (600, 12), (1500, 18), (3000, 24)):
+            if words_total <= limit:
+                return target
+        return 32
+
+    def _to_paragraphs(self, sentences: List[str], max_per_para: int = 4) -> str:
+        """Group sentences into paragraphs"""
+        return "\n\n".join(
+            " ".join(sentences[i:i + max_per_para])
+            for i in range(0, len(sentences), max_per_para)
+        )
@@ -0,0 +1,162 @@
+"""
+Frequency Sketches
+Fixed-memory approximate term frequencies for very large inputs
+"""
+import hashlib
+import heapq
+import math
+import struct
+import sys
+from array import array
+from typing import Dict, FrozenSet, List, Tuple
+
+
+class CountMinSketch:
+    """
+    Count-Min sketch: estimates never undercount, and overcount by at most
+    epsilon * total with probability at least 1 - delta
+    """
+
+    def __init__(self, epsilon: float = 0.0005, delta: float = 0.01):
+        """
+        Initialize the sketch
+
+        Args:
+            epsilon: Relative error bound (as a fraction of the total count)
+            delta: Probability of exceeding the error bound
+        """
+        self.epsilon = epsilon
+        self.delta = delta
+        self.width = math.ceil(math.e / epsilon)
+        self.depth = math.ceil(math.log(1 / delta))
+        self.total = 0
+        self._unpack = struct.Struct(f'<{self.depth}I').unpack
+        self._rows = [array('I', bytes(4 * self.width)) for _ in range(self.depth)]
+
+    def _columns(self, term: str) -> List[int]:
+        """One column per row from a single keyed digest (stable across processes)"""
+        digest = hashlib.blake2b(term.encode('utf-8', 'surrogatepass'), digest_size=4 * self.depth).digest()
+        width = self.width
+        return [h % width for h in self._unpack(digest)]
+
+    def add(self, term: str, count: int = 1) -> int:
+        """Add occurrences of a term and return its new estimate"""
+        self.total += count
+        estimate = None
+        for row, col in zip(self._rows, self._columns(term)):
+            row[col] += count
+            estimate = row[col] if estimate is None else min(estimate, row[col])
+        return estimate
+
+    def estimate(self, term: str) -> int:
+        """Estimated count of a term"""
+        return min(row[col] for row, col in zip(self._rows, self._columns(term)))
+
+    @property
+    def error_bound(self) -> float:
+        """Maximum overcount (with probability 1 - delta)"""
+        return self.epsilon * self.total
+
+    @property
+    def memory_bytes(self) -> int:
+        """Size of the counter arrays"""
+        return sum(sys.getsizeof(row) for row in self._rows)
+
+
+class HeavyHitters:
+    """Tracks the k terms with the largest estimated counts"""
+
+    def __init__(self, k: int = 256):
+        """
+        Initialize the tracker
+
+        Args:
+            k: Number of heavy hitters kept
+        """
+        self.k = k
+        self.max_count = 0
+        self._counts: Dict[str, int] = {}
+        # Min-heap of (count, term); entries go stale when a count changes
+        self._heap: List[Tuple[int, str]] = []
+
+    def offer(self, term: str, estimate: int) -> None:
+        """Consider a term with its current estimated count"""
+        # Estimates only grow and evictions drop the smallest, so the
+        # largest count ever offered is the largest tracked one
+        self.max_count = max(self.max_count, estimate)
+        if term in self._counts or len(self._counts) < self.k:
+            self._counts[term] = estimate
+            heapq.heappush(self._heap, (estimate, term))
+            self._compact()
+            return
+        while self._heap and self._counts.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        if self._heap and estimate > self._heap[0][0]:
+            _, evicted = heapq.heappop(self._heap)
+            del self._counts[evicted]
+            self._counts[term] = estimate
+            heapq.heappush(self._heap, (estimate, term))
+
+    def _compact(self) -> None:
+        """Rebuild the heap once stale entries dominate it"""
+        if len(self._heap) > 4 * self.k:
+            self._heap = [(c, t) for t, c in self._counts.items()]
+            heapq.heapify(self._heap)
+
+    def top(self) -> List[Tuple[str, int]]:
+        """Heavy hitters, largest first"""
+        return sorted(self._counts.items(), key=lambda item: item[1], reverse=True)
+
+
+class FrequencySketch:
+    """
+    Approximate replacement for the normalized word-frequency Counter
+
+    Supports .get(term, default) like the Counter it replaces, returning the
+    estimated count divided by the largest heavy-hitter count.
+    """
+
+    def __init__(self, epsilon: float = 0.0005, delta: float = 0.01, heavy_hitters: int = 256,
+                 exclude: FrozenSet[str] = frozenset()):
+        """
+        Initialize the sketch
+
+        Args:
+            epsilon: Count-Min relative error bound
+            delta: Count-Min failure probability
+            heavy_hitters: Number of top terms tracked for normalization
+            exclude: Terms that are never counted and always weigh 0 (stopwords)
+        """
+        self.counts = CountMinSketch(epsilon, delta)
+        self.heavy = HeavyHitters(heavy_hitters)
+        self.exclude = exclude
+
+    def add(self, term: str, count: int = 1) -> None:
+        """Count occurrences of a normalized term"""
+        if term and term not in self.exclude:
+            self.heavy.offer(term, self.counts.add(term, count))
+
+    def get(self, term: str, default: float = 0.0) -> float:
+        """Normalized weight of a term in [0, 1]"""
+        max_count = self.heavy.max_count
+        if not term or term in self.exclude or not max_count:
+            return default
+        return min(1.0, self.counts.estimate(term) / max_count)
+
+    def __bool__(self) -> bool:
+        return self.counts.total > 0
+
+    def error_meta(self) -> dict:
+        """Error bounds and footprint for response metadata"""
+        max_count = self.heavy.max_count
+        return {
+            'epsilon': self.counts.epsilon,
+            'delta': self.counts.delta,
+            'width': self.counts.width,
+            'depth': self.counts.depth,
+            'terms_counted': self.counts.total,
+            'count_error_bound': round(self.counts.error_bound, 2),
+            'weight_error_bound': round(self.counts.error_bound / max_count, 4) if max_count else 0.0,
+            'heavy_hitters': [term for term, _ in self.heavy.top()[:10]],
+            'memory_bytes': self.counts.memory_bytes
+        }
@@ -2,9 +2,66 @@
 Text Summarization Service
 Handles all text summarization logic and processing
 """
+import hashlib
+import os
 import re
-from collections import Counter
-from typing import List, Tuple, Optional
+import sys
+import threading
+import time
+import zlib
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Iterable, List, NamedTuple, Tuple, Optional
+
+from backend.services.cancellation import CancellationToken
+from backend.services.idf_service import IdfModel, IdfService, idf_service
+from backend.services.metrics_service import MemoryMeter
+from backend.services.sketch import FrequencySketch
+
+
+class ScoredSentence(NamedTuple):
+    """Sentence carried between reduction levels with its tokens and last score"""
+    position: int
+    text: str
+    words: List[str]
+    score: float = 0.0
+    # Number of focus terms the sentence contains, found once at tokenization
+    focus_hits: int = 0
+
+
+class ChunkCache:
+    """Thread-safe LRU cache of chunk summaries keyed by chunk content hash"""
+
+    def __init__(self, max_entries: int = 2048):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Entries kept before the least recently used is evicted (0 disables)
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        """Return a cached value or None"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if full"""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
 
 
 class SummarizerService:
@@ -20,61 +77,294 @@ class SummarizerService:
         "not", "no", "nor", "so", "than", "then", "too", "very"
     }
     
-    def __init__(self):
-        """Initialize the summarizer service"""
-        pass
+    # Number of chunk summaries merged per group at each reduction level
+    DEFAULT_FAN_IN = 8
+    
+    # Focused selection: score boost for matching every focus term (as a
+    # fraction of the group's best base score), and how many non-matching
+    # sentences per target sentence are sampled as background
+    FOCUS_BOOST = 1.0
+    FOCUS_BACKGROUND = 2
+    
+    # Chunk sizes in words; content-defined chunks end at a hash-chosen
+    # sentence boundary between the minimum and the maximum
+    CHUNK_MAX_WORDS = 1800
+    CHUNK_MIN_WORDS = 900
+    CHUNKING_MODES = ("fixed", "content")
     
-    def summarize_text(self, text: str, target_sentences: Optional[int] = 16) -> Tuple[str, dict]:
+    # Approximate term weights for huge inputs: Count-Min error bound (as a
+    # fraction of all counted terms), its failure probability, and how many
+    # heavy hitters are tracked to normalize weights
+    SKETCH_EPSILON = 0.0005
+    SKETCH_DELTA = 0.01
+    SKETCH_HEAVY_HITTERS = 256
+    
+    def __init__(self, fan_in: int = DEFAULT_FAN_IN, trace_memory: bool = False,
+                 chunking: str = "fixed", chunk_cache_size: int = 2048,
+                 approx_threshold_words: int = 0, idf: Optional[IdfService] = None):
+        """
+        Initialize the summarizer service
+        
+        Args:
+            fan_in: Chunk summaries merged per group in the tree reduction
+            trace_memory: Measure per-stage memory with tracemalloc instead of
+                estimating it from the size of live data
+            chunking: "fixed" cuts every CHUNK_MAX_WORDS words; "content" picks
+                sentence boundaries by rolling hash so edits only move nearby cuts
+            chunk_cache_size: Chunk summaries memoized by content hash (0 disables)
+            approx_threshold_words: Inputs with more words than this score
+                against a document-wide frequency sketch instead of exact
+                per-group counts (0 disables)
+            idf: Corpus IDF weights and stopwords applied on top of the
+                input's own term frequencies (None disables)
+        """
+        if fan_in < 2:
+            raise ValueError("fan_in must be at least 2")
+        if chunking not in self.CHUNKING_MODES:
+            raise ValueError(f"chunking must be one of {', '.join(self.CHUNKING_MODES)}")
+        if approx_threshold_words < 0:
+            raise ValueError("approx_threshold_words must not be negative")
+        self.fan_in = fan_in
+        self.trace_memory = trace_memory
+        self.chunking = chunking
+        self.chunk_cache = ChunkCache(chunk_cache_size)
+        self.approx_threshold_words = approx_threshold_words
+        self.idf = idf
+    
+    def summarize_text(self, text: str, target_sentences: Optional[int] = 16,
+                       deadline_ms: Optional[int] = None,
+                       focus: Optional[List[str]] = None,
+                       cancel: Optional[CancellationToken] = None,
+                       sample: bool = False) -> Tuple[str, dict]:
         """
         Main summarization method
         
         Args:
             text: Input text to summarize
             target_sentences: Target number of sentences (None for auto-size)
+            deadline_ms: Optional latency budget in milliseconds. Once it runs
+                out, remaining work falls back to cheap sentence sampling and
+                the summary is marked as degraded in the metadata.
+            focus: Optional focus phrases; selection is biased toward
+                sentences containing their terms and only those sentences
+                plus a bounded background sample are scored.
+            cancel: Optional token checked between chunks and stages; once
+                it is cancelled the work stops by raising Cancelled.
+            sample: Sample sentences without scoring from the start, as if
+                the latency budget were already spent.
             
         Returns:
             Tuple of (summary_text, metadata)
+            
+        Raises:
+            Cancelled: If the cancellation token trips mid-way
         """
+        meter = MemoryMeter(trace=self.trace_memory)
+        cpu_started = time.thread_time()
+        try:
+            summary, meta = self._summarize(text, target_sentences, deadline_ms, focus, meter, cancel, sample)
+        finally:
+            meter.close()
+        meta["cpu_ms"] = round((time.thread_time() - cpu_started) * 1000, 1)
+        meta["memory"] = meter.as_meta()
+        return summary, meta
+
+    def _summarize(self, text: str, target_sentences: Optional[int], deadline_ms: Optional[int],
+                   focus: Optional[List[str]], meter: MemoryMeter,
+                   cancel: Optional[CancellationToken] = None,
+                   sample: bool = False) -> Tuple[str, dict]:
+        """Run the summarization stages, recording memory on the meter"""
+        started = time.monotonic()
+        deadline = started + deadline_ms / 1000.0 if deadline_ms is not None else None
+        if sample:
+            # Spent from the start; meta still reports the caller's own budget
+            deadline = started
+        focus_terms = self._focus_terms(focus)
+        # One model for the whole request, even if a reload lands mid-way
+        idf = self.idf.model if self.idf is not None else None
+        focus_stats = {"candidates": 0, "scored": 0}
+        
         text = text or ""
         words_total = len(re.findall(r"[A-Za-z0-9']+", text))
         
         if words_total == 0:
-            return "", {"words_total": 0, "chunks": 0, "target_sentences": target_sentences or 0}
+            return "", {"words_total": 0, "sentences_total": 0, "chunks": 0,
+                        "target_sentences": target_sentences or 0}
 
         if target_sentences is None:
             target_sentences = self._auto_target(words_total)
+        self._checkpoint(cancel)
 
         if words_total <= 2000:
             # Simple summarization for short texts
-            sentences = self._to_sentences(text)
-            summary_sentences = self._summarize_sentences(sentences, target_sentences)
-            summary = self._to_paragraphs(summary_sentences)
-            return summary, {
+            sentences = self._to_scored(self._to_sentences(text), focus_terms=focus_terms)
+            sentences_bytes = self._sentences_bytes(sentences)
+            meter.record("tokenize", sentences_bytes)
+            self._checkpoint(cancel)
+            summary_sentences = self._rank(sentences, target_sentences, focus_terms, focus_stats, idf=idf)
+            summary = self._to_paragraphs([s.text for s in summary_sentences])
+            meter.record("select", sentences_bytes + sys.getsizeof(summary))
+            meta = {
                 "words_total": words_total, 
+                "sentences_total": len(sentences),
                 "chunks": 1, 
                 "target_sentences": target_sentences
             }
+            if idf is not None:
+                meta["idf"] = idf.as_meta()
+            if focus_terms:
+                meta["focus"] = self._focus_meta(focus_terms, focus_stats)
+            if deadline is not None:
+                meta.update(self._deadline_meta(started, deadline_ms, 0, False))
+            return summary, meta
 
-        # Hierarchical summarization for long texts
-        raw_chunks = self._chunk(text, max_words=1800)
-        chunk_summaries: List[str] = []
+        # Hierarchical summarization for long texts: score each chunk, then
+        # reduce groups of chunk summaries level by level until one remains
+        if self.chunking == "content":
+            sentence_chunks = self._chunk_content_defined(self._to_sentences(text), cancel, deadline)
+            chunks_bytes = sum(sys.getsizeof(s) for chunk in sentence_chunks for s in chunk)
+            chunk_count = len(sentence_chunks)
+            # _to_sentences holds a whitespace-collapsed copy of the input
+            meter.record("split", chunks_bytes + sys.getsizeof(text))
+        else:
+            raw_chunks = self._chunk(text, max_words=self.CHUNK_MAX_WORDS, cancel=cancel)
+            chunks_bytes = sum(sys.getsizeof(c) for c in raw_chunks)
+            chunk_count = len(raw_chunks)
+            # Split lazily so chunks reached after the deadline skip the full split
+            sentence_chunks = raw_chunks
+            # _chunk only keeps the chunk slices; the peak is the list of
+            # word strings counted above (about 56 bytes per word)
+            meter.record("split", chunks_bytes + 56 * words_total)
         
-        for chunk in raw_chunks:
-            sents = self._to_sentences(chunk)
-            chunk_summary_sents = self._summarize_sentences(sents, max(8, target_sentences // 2))
-            chunk_summaries.append(" ".join(chunk_summary_sents))
+        # Huge inputs: one fixed-size sketch of the whole document replaces
+        # the exact per-group counters, unless nothing is left to score
+        weights = None
+        if (self.approx_threshold_words and words_total > self.approx_threshold_words
+                and not self._expired(deadline)):
+            if self.chunking == "content":
+                weights = self._build_sketch((" ".join(chunk) for chunk in sentence_chunks), cancel)
+            else:
+                weights = self._build_sketch(raw_chunks, cancel)
+            meter.record("sketch", chunks_bytes + weights.counts.memory_bytes)
+        kept_bytes = 0
+        per_chunk = max(8, target_sentences // 2)
+        groups: List[List[ScoredSentence]] = []
+        chunks_sampled = 0
+        cache_hits = 0
+        position = 0
+        ranked = False
         
-        combined = "\n\n".join(chunk_summaries)
-        final_sents = self._to_sentences(combined)
-        final_summary_sents = self._summarize_sentences(final_sents, target_sentences)
-        summary = self._to_paragraphs(final_summary_sents)
+        for chunk in sentence_chunks:
+            self._checkpoint(cancel)
+            if self._expired(deadline):
+                # Out of budget: skip scoring and keep an even sample,
+                # normalizing and tokenizing only the sentences kept
+                sents = []
+                pieces = self._sentence_pieces(chunk) if isinstance(chunk, str) else chunk
+                groups.append(self._sample_pieces(pieces, per_chunk, position))
+                chunks_sampled += 1
+                chunk = pieces
+            else:
+                if isinstance(chunk, str):
+                    chunk = self._to_sentences(chunk)
+                # Chunk summaries are memoized by content, with positions
+                # stored relative to the chunk start; sketch-weighted
+                # summaries depend on the whole document and are not cached
+                key = self._chunk_key(chunk, per_chunk, focus_terms, idf) if weights is None else None
+                cached = self.chunk_cache.get(key) if key else None
+                if cached is not None:
+                    selected, candidates, scored = cached
+                    sents = []
+                    cache_hits += 1
+                    focus_stats["candidates"] += candidates
+                    focus_stats["scored"] += scored
+                else:
+                    sents = self._to_scored(chunk, focus_terms=focus_terms)
+                    before = dict(focus_stats)
+                    selected = self._rank(sents, per_chunk, focus_terms, focus_stats, weights, idf)
+                    ranked = True
+                    if key:
+                        self.chunk_cache.put(key, (
+                            selected,
+                            focus_stats["candidates"] - before["candidates"],
+                            focus_stats["scored"] - before["scored"]
+                        ))
+                groups.append([s._replace(position=s.position + position) for s in selected])
+            position += len(chunk)
+            kept_bytes += self._sentences_bytes(groups[-1])
+            meter.record("chunks", chunks_bytes + self._sentences_bytes(sents) + kept_bytes)
         
-        return summary, {
+        reduce_levels = 1
+        while len(groups) > self.fan_in:
+            reduced: List[List[ScoredSentence]] = []
+            for i in range(0, len(groups), self.fan_in):
+                self._checkpoint(cancel)
+                merged = self._merge_groups(groups[i:i + self.fan_in])
+                if self._expired(deadline):
+                    reduced.append(self._sample_sentences(merged, target_sentences))
+                else:
+                    reduced.append(self._rank(merged, target_sentences, focus_terms, weights=weights, idf=idf))
+                    ranked = True
+            groups = reduced
+            reduce_levels += 1
+            meter.record("reduce", kept_bytes + sum(self._sentences_bytes(g) for g in groups))
+            kept_bytes = sum(self._sentences_bytes(g) for g in groups)
+        
+        self._checkpoint(cancel)
+        final_sents = self._merge_groups(groups)
+        final_skipped = self._expired(deadline)
+        if final_skipped:
+            final_summary_sents = self._sample_sentences(final_sents, target_sentences)
+        else:
+            final_summary_sents = self._rank(final_sents, target_sentences, focus_terms, weights=weights, idf=idf)
+            ranked = True
+        summary = self._to_paragraphs([s.text for s in final_summary_sents])
+        meter.record("final", kept_bytes + sys.getsizeof(summary))
+        
+        meta = {
             "words_total": words_total, 
-            "chunks": len(raw_chunks), 
-            "target_sentences": target_sentences
+            "sentences_total": position,
+            "chunks": chunk_count, 
+            "target_sentences": target_sentences,
+            "reduce_levels": reduce_levels,
+            "chunking": self.chunking,
+            "chunk_cache_hits": cache_hits
         }
+        if weights is not None and ranked:
+            meta["approximate"] = weights.error_meta()
+        if idf is not None:
+            meta["idf"] = idf.as_meta()
+        if focus_terms:
+            meta["focus"] = self._focus_meta(focus_terms, focus_stats)
+        if deadline is not None:
+            meta.update(self._deadline_meta(started, deadline_ms, chunks_sampled, final_skipped))
+        return summary, meta
     
+    def _expired(self, deadline: Optional[float]) -> bool:
+        """Check whether the latency budget has run out"""
+        return deadline is not None and time.monotonic() >= deadline
+
+    def _checkpoint(self, cancel: Optional[CancellationToken]) -> None:
+        """Stop here if the work was cancelled"""
+        if cancel is not None:
+            cancel.check()
+
+    def _deadline_meta(self, started: float, deadline_ms: Optional[int],
+                       chunks_sampled: int, final_skipped: bool) -> dict:
+        """Describe how the latency budget affected the summary"""
+        degraded_stages: List[str] = []
+        if chunks_sampled:
+            degraded_stages.append("chunks")
+        if final_skipped:
+            degraded_stages.append("final_rerank")
+        return {
+            "deadline_ms": deadline_ms,
+            "elapsed_ms": round((time.monotonic() - started) * 1000, 1),
+            "degraded": bool(degraded_stages),
+            "degraded_stages": degraded_stages,
+            "chunks_sampled": chunks_sampled
+        }
+
     def _to_sentences(self, text: str) -> List[str]:
         """Split text into sentences"""
         text = re.sub(r"\s+", " ", text or "").strip()
@@ -88,8 +378,8 @@ class SummarizerService:
         """Normalize word for frequency analysis"""
         return re.sub(r"[^a-z0-9]", "", word.lower())
 
-    def _word_freq(self, words: List[str]) -> Counter:
-        """Calculate normalized word frequencies"""
+    def _word_freq(self, words: List[str], idf: Optional[IdfModel] = None) -> Counter:
+        """Calculate normalized word frequencies, weighted by corpus IDF when given"""
         words_norm = [self._normalize(w) for w in words]
         words_filt = [w for w in words_norm if w and w not in self.STOPWORDS]
         freq = Counter(words_filt)
@@ -100,11 +390,40 @@ class SummarizerService:
         max_f = max(freq.values())
         for k in list(freq.keys()):
             freq[k] = freq[k] / max_f
+        if idf is not None:
+            freq = self._apply_idf(freq, idf)
         return freq
 
-    def _score_sentence(self, sentence: str, freq: Counter) -> float:
+    def _apply_idf(self, freq: Dict[str, float], idf: IdfModel) -> Counter:
+        """Scale term weights by corpus IDF, drop corpus stopwords and renormalize to a maximum of 1"""
+        weighted = Counter()
+        for term, value in freq.items():
+            w = value * idf.weight(term) if term else 0.0
+            if w > 0:
+                weighted[term] = w
+        if weighted:
+            max_w = max(weighted.values())
+            for k in list(weighted.keys()):
+                weighted[k] = weighted[k] / max_w
+        return weighted
+
+    def _build_sketch(self, chunks: Iterable[str],
+                      cancel: Optional[CancellationToken] = None) -> FrequencySketch:
+        """Stream chunks into a frequency sketch, counting one chunk at a time"""
+        sketch = FrequencySketch(self.SKETCH_EPSILON, self.SKETCH_DELTA,
+                                 self.SKETCH_HEAVY_HITTERS, frozenset(self.STOPWORDS))
+        for chunk in chunks:
+            self._checkpoint(cancel)
+            # Tokens only contain [A-Za-z0-9'], so this matches _normalize
+            counts = Counter(w.lower().replace("'", "") for w in re.findall(r"[A-Za-z0-9']+", chunk))
+            for term, count in counts.items():
+                sketch.add(term, count)
+        return sketch
+
+    def _score_sentence(self, sentence: str, freq: Counter, words: Optional[List[str]] = None) -> float:
         """Score a sentence based on word frequency and other signals"""
-        words = re.findall(r"[A-Za-z0-9']+", sentence)
+        if words is None:
+            words = re.findall(r"[A-Za-z0-9']+", sentence)
         if not words:
             return 0.0
         
@@ -125,51 +444,252 @@ class SummarizerService:
         
         return (base + bonus) / (len(words) ** 0.5)
 
-    def _summarize_sentences(self, sentences: List[str], target_count: int) -> List[str]:
-        """Select top sentences for summary"""
+    def _to_scored(self, sentences: List[str], start: int = 0,
+                   focus_terms: Optional[List[str]] = None) -> List[ScoredSentence]:
+        """
+        Tokenize sentences once so later levels can rescore without re-splitting
+        
+        With focus terms, their postings are built here too and each
+        sentence carries its match count through every reduction level.
+        """
+        scored = [
+            ScoredSentence(start + i, s, re.findall(r"[A-Za-z0-9']+", s))
+            for i, s in enumerate(sentences)
+        ]
+        if focus_terms:
+            hits: Counter = Counter()
+            for postings in self._index_sentences(scored, focus_terms).values():
+                hits.update(postings)
+            for i, count in hits.items():
+                scored[i] = scored[i]._replace(focus_hits=count)
+        return scored
+
+    def _sentences_bytes(self, sentences: List[ScoredSentence]) -> int:
+        """Approximate memory held by scored sentences: text, token list and tokens"""
+        return sum(105 + 2 * len(s.text) + 57 * len(s.words) for s in sentences)
+
+    def _merge_groups(self, groups: List[List[ScoredSentence]]) -> List[ScoredSentence]:
+        """Concatenate sibling groups, keeping document order"""
+        merged: List[ScoredSentence] = []
+        for group in groups:
+            merged.extend(group)
+        return merged
+
+    def _focus_terms(self, focus: Optional[List[str]]) -> List[str]:
+        """Normalize focus phrases into distinct non-stopword terms"""
+        terms: List[str] = []
+        for phrase in focus or []:
+            for w in re.findall(r"[A-Za-z0-9']+", phrase):
+                term = self._normalize(w)
+                if term and term not in self.STOPWORDS and term not in terms:
+                    terms.append(term)
+        return terms
+
+    def _focus_meta(self, focus_terms: List[str], focus_stats: Dict[str, int]) -> dict:
+        """Describe how much of the input the focused selection touched"""
+        return {
+            "terms": focus_terms,
+            "candidates": focus_stats["candidates"],
+            "scored": focus_stats["scored"]
+        }
+
+    def _index_sentences(self, sentences: List[ScoredSentence],
+                         terms: List[str]) -> Dict[str, List[int]]:
+        """Build postings from each of the given normalized terms to the sentences containing it"""
+        index: Dict[str, List[int]] = {}
+        for i, s in enumerate(sentences):
+            # Only sentences whose text contains a term as a substring can
+            # contain it as a token, so most are skipped without a token walk
+            lowered = s.text.lower().replace("'", "")
+            present = [t for t in terms if t in lowered]
+            if not present:
+                continue
+            # Tokens only contain [A-Za-z0-9'], so this matches _normalize
+            tokens = {w.lower().replace("'", "") for w in s.words}
+            for term in present:
+                if term in tokens:
+                    index.setdefault(term, []).append(i)
+        return index
+
+    def _rank(self, sentences: List[ScoredSentence], target_count: int,
+              focus_terms: List[str], focus_stats: Optional[Dict[str, int]] = None,
+              weights: Optional[FrequencySketch] = None,
+              idf: Optional[IdfModel] = None) -> List[ScoredSentence]:
+        """Select top sentences, restricted to focus postings plus background when focused"""
+        if not focus_terms:
+            return self._select_sentences(sentences, target_count, weights=weights, idf=idf)
+        
+        # Matches were counted at tokenization; no re-indexing per group
+        matches = {i: s.focus_hits for i, s in enumerate(sentences) if s.focus_hits}
+        
+        # Evenly spaced background sample keeps general context in the pool
+        background_size = self.FOCUS_BACKGROUND * target_count
+        others = [i for i in range(len(sentences)) if i not in matches]
+        if len(others) > background_size:
+            step = len(others) / background_size
+            others = [others[int(i * step)] for i in range(background_size)]
+        
+        pool = sorted(list(matches) + others)
+        if focus_stats is not None:
+            focus_stats["candidates"] += len(matches)
+            focus_stats["scored"] += len(pool)
+        
+        boosts = {
+            sentences[i].position: self.FOCUS_BOOST * count / len(focus_terms)
+            for i, count in matches.items()
+        }
+        return self._select_sentences([sentences[i] for i in pool], target_count, boosts, weights, idf)
+
+    def _select_sentences(self, sentences: List[ScoredSentence], target_count: int,
+                          boosts: Optional[Dict[int, float]] = None,
+                          weights: Optional[FrequencySketch] = None,
+                          idf: Optional[IdfModel] = None) -> List[ScoredSentence]:
+        """
+        Score sentences and keep the top ones in order
+        
+        Term weights come from the group's own word frequencies, or from the
+        document-wide sketch when one is given, scaled by corpus IDF if loaded.
+        """
         if target_count <= 0:
             return []
         if len(sentences) <= target_count:
             return sentences
         
         # Calculate word frequencies
-        all_words = []
-        for s in sentences:
-            all_words.extend(re.findall(r"[A-Za-z0-9']+", s))
-        freq = self._word_freq(all_words)
+        if weights is not None:
+            # Look each distinct term up once; this table is bounded by the
+            # group's size, like the exact counter it replaces
+            freq = {}
+            for s in sentences:
+                for w in s.words:
+                    term = self._normalize(w)
+                    if term not in freq:
+                        freq[term] = weights.get(term)
+            if idf is not None:
+                freq = self._apply_idf(freq, idf)
+        else:
+            all_words: List[str] = []
+            for s in sentences:
+                all_words.extend(s.words)
+            freq = self._word_freq(all_words, idf)
         
         # Score and rank sentences
-        scored = [(i, self._score_sentence(s, freq)) for i, s in enumerate(sentences)]
+        scored = [s._replace(score=self._score_sentence(s.text, freq, s.words)) for s in sentences]
+        if boosts:
+            top = max(s.score for s in scored)
+            scored = [s._replace(score=s.score + top * boosts.get(s.position, 0.0)) for s in scored]
         
         # Select top sentences while preserving original order
-        top_idx = sorted(
-            sorted(scored, key=lambda x: x[1], reverse=True)[:target_count], 
-            key=lambda x: x[0]
+        return sorted(
+            sorted(scored, key=lambda s: s.score, reverse=True)[:target_count], 
+            key=lambda s: s.position
         )
+
+    def _sentence_pieces(self, text: str) -> List[str]:
+        """
+        Split text like _to_sentences without normalizing whitespace first
         
-        return [sentences[i] for i, _ in top_idx]
+        Yields the same sentences, except that each may still contain runs
+        of whitespace; _sample_pieces normalizes the ones it keeps.
+        """
+        parts = re.split(r"(?<=[.!?])\s+(?=[A-Z0-9])", text or "")
+        return [s for s in parts if len(s.strip()) > 1]
 
-    def _chunk(self, text: str, max_words: int = 1500) -> List[str]:
+    def _sample_pieces(self, pieces: List[str], target_count: int, start: int) -> List[ScoredSentence]:
+        """Evenly sample sentence strings, then normalize and tokenize just the sampled ones"""
+        sampled: List[ScoredSentence] = []
+        for i in self._sample_sentences(range(len(pieces)), target_count):
+            sentence = re.sub(r"\s+", " ", pieces[i]).strip()
+            sampled.append(ScoredSentence(start + i, sentence, re.findall(r"[A-Za-z0-9']+", sentence)))
+        return sampled
+
+    def _sample_sentences(self, sentences: list, target_count: int) -> list:
+        """Cheap fallback selection: evenly spaced sentences in original order"""
+        if target_count <= 0:
+            return []
+        if len(sentences) <= target_count:
+            return sentences
+        step = len(sentences) / target_count
+        return [sentences[int(i * step)] for i in range(target_count)]
+
+    def _chunk(self, text: str, max_words: int = 1500,
+               cancel: Optional[CancellationToken] = None) -> List[str]:
         """Split text into chunks for hierarchical processing"""
-        words = re.findall(r"[A-Za-z0-9']+|\s+|\S", text)
+        # Each chunk ends right after its max_words-th word; slicing at word
+        # matches avoids tokenizing the whitespace and punctuation between them
         chunks: List[str] = []
-        current: List[str] = []
+        start = 0
         count = 0
         
-        for token in words:
-            current.append(token)
-            if re.match(r"[A-Za-z0-9']+", token):
-                count += 1
+        for match in re.finditer(r"[A-Za-z0-9']+", text):
+            count += 1
             if count >= max_words:
-                chunks.append("".join(current).strip())
+                end = match.end()
+                chunks.append(text[start:end].strip())
+                start = end
+                count = 0
+                self._checkpoint(cancel)
+        
+        if start < len(text):
+            chunks.append(text[start:].strip())
+        
+        return chunks
+
+    def _chunk_content_defined(self, sentences: List[str],
+                               cancel: Optional[CancellationToken] = None,
+                               deadline: Optional[float] = None) -> List[List[str]]:
+        """
+        Split sentences into chunks at content-defined boundaries
+        
+        A rolling hash over the last two sentences decides where to cut, so a
+        cut depends only on nearby text: inserting words early in a document
+        moves the cuts around the edit and leaves later chunks unchanged.
+        Each sentence ends a chunk with probability proportional to its word
+        count once CHUNK_MIN_WORDS is reached, averaging a cut about halfway
+        to CHUNK_MAX_WORDS, which is always enforced. Once the deadline has
+        passed, word counts are estimated from spaces to finish quickly.
+        """
+        spread = max(1, (self.CHUNK_MAX_WORDS - self.CHUNK_MIN_WORDS) // 2)
+        chunks: List[List[str]] = []
+        current: List[str] = []
+        count = 0
+        previous = 0
+        expired = False
+        
+        for sentence in sentences:
+            if expired:
+                n_words = sentence.count(" ") + 1
+            else:
+                n_words = len(re.findall(r"[A-Za-z0-9']+", sentence))
+            current.append(sentence)
+            count += n_words
+            digest = zlib.crc32(sentence.encode("utf-8", "surrogatepass"))
+            rolling = (previous * 31 + digest) & 0xFFFFFFFF
+            previous = digest
+            if count >= self.CHUNK_MAX_WORDS or (
+                    count >= self.CHUNK_MIN_WORDS and rolling % spread < n_words):
+                chunks.append(current)
                 current = []
                 count = 0
+                self._checkpoint(cancel)
+                expired = self._expired(deadline)
         
         if current:
-            chunks.append("".join(current).strip())
-        
+            chunks.append(current)
         return chunks
 
+    def _chunk_key(self, sentences: List[str], target_count: int, focus_terms: List[str],
+                   idf: Optional[IdfModel] = None) -> str:
+        """Content hash of a chunk plus the parameters (and IDF model) its summary depends on"""
+        digest = hashlib.sha1()
+        for sentence in sentences:
+            digest.update(sentence.encode("utf-8", "surrogatepass"))
+            digest.update(b"\0")
+        digest.update(f"{target_count}|{'|'.join(focus_terms)}".encode("utf-8"))
+        if idf is not None:
+            digest.update(f"|idf:{idf.tag}".encode("utf-8"))
+        return digest.hexdigest()
+
     def _auto_target(self, words_total: int) -> int:
         """Automatically determine target sentence count based on text length"""
         if words_total <= 180:
@@ -191,11 +711,21 @@ class SummarizerService:
 
 
 # Global service instance
-summarizer_service = SummarizerService()
+summarizer_service = SummarizerService(
+    fan_in=int(os.environ.get('CARRYON_REDUCE_FAN_IN', SummarizerService.DEFAULT_FAN_IN)),
+    trace_memory=os.environ.get('CARRYON_TRACE_MEMORY', 'False').lower() == 'true',
+    chunking=os.environ.get('CARRYON_CHUNKING', 'fixed'),
+    chunk_cache_size=int(os.environ.get('CARRYON_CHUNK_CACHE', 2048)),
+    approx_threshold_words=int(os.environ.get('CARRYON_APPROX_THRESHOLD_WORDS', 250000)),
+    idf=idf_service
+)
 
 
-def summarize_text(text: str, target_sentences: Optional[int] = 16) -> Tuple[str, dict]:
+def summarize_text(text: str, target_sentences: Optional[int] = 16,
+                   deadline_ms: Optional[int] = None,
+                   focus: Optional[List[str]] = None,
+                   cancel: Optional[CancellationToken] = None) -> Tuple[str, dict]:
     """
     Convenience function for backward compatibility
     """
-    return summarizer_service.summarize_text(text, target_sentences)
\ No newline at end of file
+    return summarizer_service.summarize_text(text, target_sentences, deadline_ms, focus, cancel)
\ No newline at end of file
@@ -0,0 +1,142 @@
+"""
+IDF Builder
+Offline tool that computes corpus IDF weights and a stopword table from stored
+transcripts and writes them in the format mapped by backend.services.idf_service
+
+Usage:
+    python -m backend.utils.idf_builder transcripts/ more.jsonl -o idf.bin
+"""
+import argparse
+import json
+import math
+import os
+import re
+import sys
+import tempfile
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from backend.services.idf_service import HEADER, MAGIC, SLOT, STOPWORD, VERSION, term_hash
+from backend.services.summarizer_service import SummarizerService
+
+TEXT_SUFFIXES = ('.txt', '.md')
+
+
+def iter_documents(sources: Iterable[str]) -> Iterator[str]:
+    """
+    Yield transcript texts
+
+    Directories are searched recursively. Each .txt/.md file is one
+    document; each line of a .jsonl file is one document, either a JSON
+    string or an object with a "text" field.
+    """
+    for source in sources:
+        path = Path(source)
+        files = sorted(p for p in path.rglob('*') if p.is_file()) if path.is_dir() else [path]
+        for file in files:
+            suffix = file.suffix.lower()
+            if suffix == '.jsonl':
+                with open(file, encoding='utf-8', errors='replace') as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        record = json.loads(line)
+                        text = record.get('text') if isinstance(record, dict) else record
+                        if isinstance(text, str):
+                            yield text
+            elif suffix in TEXT_SUFFIXES or not path.is_dir():
+                yield file.read_text(encoding='utf-8', errors='replace')
+
+
+def document_terms(text: str) -> set:
+    """Distinct normalized terms of a document (same normalization as the summarizer)"""
+    return {w.lower().replace("'", "") for w in re.findall(r"[A-Za-z0-9']+", text)} - {''}
+
+
+def build(documents: Iterable[str], min_df: int = 2,
+          stopword_ratio: float = 0.8) -> Tuple[Dict[str, Tuple[float, bool]], int]:
+    """
+    Compute smoothed IDF, ln((1 + N) / (1 + df)) + 1, per term
+
+    Args:
+        documents: Transcript texts
+        min_df: Terms in fewer documents are left out; lookups treat them as unseen
+        stopword_ratio: Terms in at least this fraction of documents are
+            flagged as stopwords, in addition to the summarizer's own list
+
+    Returns:
+        Tuple of ({term: (idf, is_stopword)}, document count)
+    """
+    df: Counter = Counter()
+    n_docs = 0
+    for text in documents:
+        df.update(document_terms(text))
+        n_docs += 1
+
+    table: Dict[str, Tuple[float, bool]] = {}
+    for term, count in df.items():
+        if count < min_df and term not in SummarizerService.STOPWORDS:
+            continue
+        idf = math.log((1 + n_docs) / (1 + count)) + 1
+        stopword = term in SummarizerService.STOPWORDS or count >= stopword_ratio * n_docs
+        table[term] = (idf, stopword)
+    return table, n_docs
+
+
+def write_model(path: str, table: Dict[str, Tuple[float, bool]], n_docs: int) -> None:
+    """
+    Write the table as an open-addressing hash file
+
+    The file is written next to the target and renamed into place, so
+    servers reloading it never map a partial file.
+    """
+    slots = 8
+    while slots < 2 * len(table):
+        slots *= 2
+    default_idf = math.log(1 + n_docs) + 1
+
+    buffer = bytearray(HEADER.size + slots * SLOT.size)
+    HEADER.pack_into(buffer, 0, MAGIC, VERSION, 0, slots, len(table), n_docs, default_idf, default_idf)
+    mask = slots - 1
+    for term, (idf, stopword) in table.items():
+        h = term_hash(term)
+        i = h & mask
+        while SLOT.unpack_from(buffer, HEADER.size + i * SLOT.size)[0] != 0:
+            i = (i + 1) & mask
+        SLOT.pack_into(buffer, HEADER.size + i * SLOT.size, h, idf, STOPWORD if stopword else 0)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.idf-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(buffer)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point: python -m backend.utils.idf_builder"""
+    parser = argparse.ArgumentParser(description='Build the corpus IDF file used for sentence scoring')
+    parser.add_argument('sources', nargs='+', help='transcript directories, text files or .jsonl files')
+    parser.add_argument('-o', '--output', default='idf.bin')
+    parser.add_argument('--min-df', type=int, default=2, help='drop terms in fewer documents')
+    parser.add_argument('--stopword-ratio', type=float, default=0.8,
+                        help='flag terms in at least this fraction of documents as stopwords')
+    args = parser.parse_args(argv)
+
+    table, n_docs = build(iter_documents(args.sources), args.min_df, args.stopword_ratio)
+    if not n_docs:
+        print("no documents found")
+        return 1
+    write_model(args.output, table, n_docs)
+    stopwords = sum(1 for _, stopword in table.values() if stopword)
+    print(f"{args.output}: {len(table)} terms ({stopwords} stopwords) from {n_docs} documents")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())